@@ -0,0 +1,60 @@
+"""
+Benchmark del overhead por llamada de la API con documentos pequeños
+
+Compara Converter.convert_many con el pegamento que había que escribir
+antes (detectar el formato, decodificar, parsear y llamar a to_toon).
+
+Uso:
+    python -m benchmarks.bench_api_overhead [--docs N]
+"""
+import argparse
+import json
+import time
+
+from src import Converter
+from src.transformers.to_toon import TOONTransformer
+from src.utils.io import sniff_format
+
+
+def make_payloads(docs: int) -> list:
+    return [
+        json.dumps({"id": i, "name": f"user {i}", "tags": ["a", "b"], "active": i % 2 == 0}).encode()
+        for i in range(docs)
+    ]
+
+
+def ad_hoc(payload: bytes) -> str:
+    text = payload.decode('utf-8-sig')
+    sniff_format(text[:4096].encode())
+    return TOONTransformer.to_toon(json.loads(text))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=50000)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.docs)
+    converter = Converter()
+
+    start = time.perf_counter()
+    baseline = [ad_hoc(p) for p in payloads]
+    glue = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = list(converter.convert_many(payloads))
+    api = time.perf_counter() - start
+
+    fixed = Converter(input_format="json")
+    start = time.perf_counter()
+    list(fixed.convert_many(payloads))
+    known = time.perf_counter() - start
+
+    assert results == baseline
+    print(f"ad-hoc glue          : {glue / args.docs * 1e6:6.1f} µs/doc")
+    print(f"convert_many         : {api / args.docs * 1e6:6.1f} µs/doc")
+    print(f"convert_many (json)  : {known / args.docs * 1e6:6.1f} µs/doc")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark de re-codificación incremental frente a completa
+
+Uso:
+    python -m benchmarks.bench_incremental [--keys N]
+"""
+import argparse
+import copy
+import time
+
+from src.models.structure import DocumentStructure
+from src.parsers.json_parser import JSONParser
+from src.transformers.incremental import IncrementalEncoder
+from src.transformers.to_schema import SchemaTransformer
+from src.transformers.to_toon import TOONTransformer
+
+
+def make_document(keys: int) -> dict:
+    return {
+        f"service_{i}": {
+            "image": f"registry/app-{i}:1.0",
+            "replicas": i % 5 + 1,
+            "env": {f"VAR_{j}": f"value {j}" for j in range(10)},
+            "ports": [{"name": "http", "port": 8000 + i}],
+        }
+        for i in range(keys)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=2000)
+    args = parser.parse_args()
+
+    data = make_document(args.keys)
+    encoder = IncrementalEncoder()
+    encoder.update(data)
+
+    edited = copy.deepcopy(data)
+    edited["service_7"]["replicas"] = 42
+
+    start = time.perf_counter()
+    TOONTransformer.to_toon(edited)
+    SchemaTransformer.to_json_schema(DocumentStructure(root=JSONParser._analyze_value(edited)))
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    encoder.update(edited)
+    incremental = time.perf_counter() - start
+
+    print(f"full re-encode   : {full * 1000:8.1f} ms")
+    print(f"incremental      : {incremental * 1000:8.1f} ms ({len(encoder.changed)} subtree re-encoded)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Microbenchmark de comillas y escapes en el codificador TOON
+
+Compara la regla anterior (un generador Python por string) con el motor
+de quoting basado en regex compiladas y str.replace, sobre datasets con
+muchos strings: columnas tabulares con valores repetidos y textos libres.
+
+Uso:
+    python -m benchmarks.bench_quoting [--rows N]
+"""
+import argparse
+import random
+import time
+
+from src.parsers.toon_parser import TOONParser
+from src.transformers.to_toon import TOONTransformer
+from src.utils.quoting import quote_string
+
+
+def legacy_quote(value: str) -> str:
+    """Regla de comillas anterior de _value_to_toon (sin escapes)"""
+    if any(c in value for c in " ,{}[]:\n\t"):
+        return f'"{value}"'
+    return value
+
+
+def make_strings(count: int) -> list:
+    rng = random.Random(7)
+    words = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta"]
+    return [
+        rng.choice([
+            lambda: rng.choice(words),
+            lambda: " ".join(rng.choices(words, k=4)),
+            lambda: f"{rng.choice(words)}-{rng.randint(0, 99999)}",
+            lambda: f'{rng.choice(words)} "quoted", ok',
+        ])()
+        for _ in range(count)
+    ]
+
+
+def make_table(rows: int, free_text: bool = True) -> dict:
+    """Tickets con columnas de valores repetidos y, opcionalmente, texto libre"""
+    rng = random.Random(11)
+    statuses = ["active", "pending", "on hold", "closed"]
+    countries = ["Perú", "Chile", "Costa Rica", "United States"]
+    tickets = []
+    for i in range(rows):
+        ticket = {
+            "status": rng.choice(statuses),
+            "country": rng.choice(countries),
+            "owner": f"user{rng.randint(0, 50)}",
+            "team": rng.choice(["core", "infra", "data ops"]),
+        }
+        if free_text:
+            ticket["id"] = f"T-{i}"
+            ticket["summary"] = f"Issue {i}: cannot log in, \"error\" shown"
+        tickets.append(ticket)
+    return {"tickets": tickets}
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    strings = make_strings(args.rows)
+    legacy = timed(lambda: [legacy_quote(s) for s in strings])
+    engine = timed(lambda: [quote_string(s) for s in strings])
+    print(f"quote {len(strings)} strings")
+    print(f"  legacy generator : {legacy * 1e9 / len(strings):6.0f} ns/string")
+    print(f"  quote_string     : {engine * 1e9 / len(strings):6.0f} ns/string")
+
+    for name, free_text in (("repeated values", False), ("free text", True)):
+        data = make_table(args.rows, free_text)
+        encode = timed(TOONTransformer.to_toon, data)
+        text = TOONTransformer.to_toon(data)
+        decode = timed(TOONParser._parse_toon, text)
+        assert TOONParser._parse_toon(text) == data
+        cells = args.rows * len(data["tickets"][0])
+        print(f"tabular, {name}: {args.rows} rows, {cells} string cells (round-trip ok)")
+        print(f"  encode: {encode * 1000:8.1f} ms ({encode * 1e9 / cells:5.0f} ns/cell)")
+        print(f"  decode: {decode * 1000:8.1f} ms ({decode * 1e9 / cells:5.0f} ns/cell)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark de tablas TOON con unión de claves (arrays casi uniformes)
+
+Compara el formato por elementos (sparsity=0) con la tabla con celdas
+ausentes en tamaño y tiempo de codificación, y verifica el round-trip.
+
+Uso:
+    python -m benchmarks.bench_sparse_tabular [--records N]
+"""
+import argparse
+import time
+
+from src.parsers.toon_parser import TOONParser
+from src.transformers.to_toon import TOONTransformer
+
+
+def make_payload(records: int) -> dict:
+    # Respuesta típica de API: algunos campos opcionales en pocos registros
+    return {
+        "items": [
+            {
+                "id": i,
+                "login": f"user{i}",
+                "name": f"User {i}",
+                "email": f"user{i}@example.com",
+                "active": i % 2 == 0,
+                **({"company": "Acme Inc"} if i % 7 == 0 else {}),
+                **({"location": "Lima"} if i % 11 == 0 else {}),
+            }
+            for i in range(records)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=50_000)
+    args = parser.parse_args()
+
+    data = make_payload(args.records)
+    results = {}
+    for label, sparsity in (("per-item", 0.0), ("key-union", TOONTransformer.TABULAR_MAX_SPARSITY)):
+        start = time.perf_counter()
+        output = TOONTransformer.to_toon(data, sparsity=sparsity)
+        results[label] = (len(output), time.perf_counter() - start, output)
+
+    for label, (size, elapsed, _) in results.items():
+        print(f"{label:<10}: {size:>12,} bytes  {elapsed * 1000:8.1f} ms")
+
+    roundtrip = TOONParser._parse_toon(results["key-union"][2]) == data
+    print(f"key-union round-trip: {'ok' if roundtrip else 'FAILED'}")
+
+
+if __name__ == "__main__":
+    main()
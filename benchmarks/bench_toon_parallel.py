@@ -0,0 +1,49 @@
+"""
+Benchmark de codificación TOON en paralelo (escalado de 1 a N procesos)
+
+Uso:
+    python -m benchmarks.bench_toon_parallel [--rows N] [--max-workers N]
+"""
+import argparse
+import os
+import time
+
+from src.transformers.to_toon import TOONTransformer
+
+
+def make_document(rows: int) -> dict:
+    return {
+        "users": [
+            {"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "active": i % 2 == 0, "score": i * 0.5}
+            for i in range(rows)
+        ],
+        "events": [
+            {"id": i, "payload": {"kind": "click", "tags": ["a", "b"]}} if i % 2 else {"id": i}
+            for i in range(rows // 2)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    data = make_document(args.rows)
+
+    start = time.perf_counter()
+    serial = TOONTransformer.to_toon(data)
+    baseline = time.perf_counter() - start
+    print(f"serial   : {baseline:.3f}s ({len(serial):,} bytes)")
+
+    for workers in range(2, args.max_workers + 1):
+        start = time.perf_counter()
+        output = TOONTransformer.to_toon(data, workers=workers)
+        elapsed = time.perf_counter() - start
+        status = "identical" if output == serial else "MISMATCH"
+        print(f"-j {workers:<6}: {elapsed:.3f}s (x{baseline / elapsed:.2f}, {status})")
+
+
+if __name__ == "__main__":
+    main()
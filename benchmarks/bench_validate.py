@@ -0,0 +1,61 @@
+"""
+Benchmark de validación compilada (records/s)
+
+Uso:
+    python -m benchmarks.bench_validate [--records N] [--workers 1,2,4]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from src.parsers.json_parser import JSONParser
+from src.transformers.to_schema import SchemaTransformer
+from src.validators.schema_validator import SchemaValidator
+
+
+def make_record(i: int) -> dict:
+    return {
+        "id": i,
+        "name": f"user-{i}",
+        "email": f"user{i}@example.com",
+        "active": i % 3 != 0,
+        "score": random.random() * 100,
+        "tags": ["a", "b", "c"][: i % 4],
+        "address": {"street": f"{i} Main St", "city": "New York", "zipcode": 10000 + i},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--workers", default="1,2,4")
+    args = parser.parse_args()
+
+    sample = make_record(1)
+    schema = SchemaTransformer.to_json_schema(JSONParser.parse(json.dumps(sample)))
+    validator = SchemaValidator(schema)
+    records = [make_record(i) for i in range(args.records)]
+
+    start = time.perf_counter()
+    invalid = sum(1 for _ in validator.iter_invalid(records))
+    elapsed = time.perf_counter() - start
+    print(f"in-memory     : {args.records / elapsed:>12,.0f} records/s ({invalid} invalid)")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        path = f.name
+
+    try:
+        for workers in (int(w) for w in args.workers.split(",")):
+            report = validator.validate_file(path, workers=workers)
+            print(f"ndjson -j {workers:<3} : {report.records_per_second:>12,.0f} records/s")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
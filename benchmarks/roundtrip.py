@@ -0,0 +1,330 @@
+"""
+Round-trip diferencial y regresión de rendimiento de TOON
+
+Comprueba que TOONParser._parse_toon(TOONTransformer.to_toon(x)) == x
+(con igualdad estricta de tipos) para documentos aleatorios de varias
+clases y para un corpus de archivos, y mide el throughput de codificación
+y decodificación de cada clase. Falla (exit 1) si algún documento no
+sobrevive al round-trip o si el throughput cae por debajo de la línea
+base guardada en benchmarks/baseline.json menos la tolerancia.
+
+Las líneas base dependen de la máquina: al cambiar de entorno se vuelven
+a registrar con --update-baseline.
+
+Uso:
+    python -m benchmarks.roundtrip [--count N] [--seed S] [--corpus FILE ...]
+    python -m benchmarks.roundtrip --update-baseline
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from src import Converter
+from src.parsers.yaml_parser import YAMLParser
+from src.parsers.toon_parser import TOONParser
+from src.transformers.to_toon import TOONTransformer
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+CORPUS_ROOT = Path(__file__).resolve().parent.parent
+
+# Strings que rompen reglas de comillas ingenuas
+_TRICKY_STRINGS = [
+    "", " ", "-", "---", "null", "true", "false", "123", "-7", "1.5", "1e5", "007",
+    "#tag", " lead", "trail ", "a,b", "a, b", "k: v", '"quoted"', 'say "hi"',
+    "back\\slash", "line\nbreak", "tab\there", "cr\rlf", "[x]", "{y}", "Perú",
+    "emoji 🎯", " sep", "- item",
+]
+_CHARS = "abcxyz019 ,:-#\"\\\n\t[]{}é_."
+# YAML con claves que no son str (códigos HTTP de OpenAPI, booleanos): TOON
+# las escribe con str(), así que vuelven como claves str
+_YAML_CASES = [
+    "200: ok\n404: not found\n",
+    "responses:\n  200: {description: ok}\n  404: {description: missing}\n",
+    "rows:\n  - {1: a, 2: b}\n  - {1: c, 2: d}\nflags: {true: on, 1.5: x}\n",
+]
+_KEYS = ["id", "name", "type", "value", "first name", "a:b", "", "-k", "#c", "x.y/z", "200", "k,v", 'q"k']
+
+
+def strict_equal(a: Any, b: Any) -> bool:
+    """
+    Igualdad que distingue 1, 1.0 y True
+
+    El orden de las claves no cuenta (como en JSON): una tabla TOON escribe
+    todas las filas con el orden de sus columnas.
+    """
+    if type(a) is not type(b):
+        return False
+    if type(a) is dict:
+        return a.keys() == b.keys() and all(strict_equal(a[k], b[k]) for k in a)
+    if type(a) is list:
+        return len(a) == len(b) and all(strict_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def string_keys(value: Any) -> Any:
+    """El valor con todas las claves convertidas con str(), como las escribe TOON"""
+    if type(value) is dict:
+        return {str(k): string_keys(v) for k, v in value.items()}
+    if type(value) is list:
+        return [string_keys(item) for item in value]
+    return value
+
+
+# Generadores por clase de documento
+
+def random_string(rng: random.Random) -> str:
+    if rng.random() < 0.3:
+        return rng.choice(_TRICKY_STRINGS)
+    return "".join(rng.choices(_CHARS, k=rng.randint(1, 12)))
+
+
+def random_key(rng: random.Random) -> str:
+    return rng.choice(_KEYS) if rng.random() < 0.5 else random_string(rng)
+
+
+def random_scalar(rng: random.Random) -> Any:
+    kind = rng.randrange(6)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return rng.random() < 0.5
+    if kind == 2:
+        return rng.randint(-10 ** 6, 10 ** 6)
+    if kind == 3:
+        return rng.choice([0.0, -0.0, 1.5, 1e16, 1e-05, rng.uniform(-1e3, 1e3)])
+    return random_string(rng)
+
+
+def random_value(rng: random.Random, depth: int = 0) -> Any:
+    """Valor JSON arbitrario: objetos, listas mixtas, vacíos y escalares"""
+    kind = rng.randrange(4) if depth < 4 else 3
+    if kind == 0:
+        return {random_key(rng): random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+    if kind == 1:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    if kind == 2:
+        keys = [random_key(rng) for _ in range(rng.randint(1, 3))]
+        return [{k: random_scalar(rng) for k in keys if rng.random() < 0.8} for _ in range(rng.randint(1, 4))]
+    return random_scalar(rng)
+
+
+def tabular_document(rng: random.Random, rows: int) -> Dict[str, Any]:
+    statuses = ["active", "pending", "on hold", "closed"]
+    return {
+        "records": [
+            {
+                "id": i,
+                "name": f"user {i}",
+                "status": rng.choice(statuses),
+                "score": round(rng.uniform(0, 100), 2),
+                "verified": rng.random() < 0.5,
+                "manager": None if i % 7 else f"user {i // 7}",
+            }
+            for i in range(rows)
+        ]
+    }
+
+
+def sparse_document(rng: random.Random, rows: int) -> Dict[str, Any]:
+    fields = ["id", "email", "phone", "city", "notes"]
+    return {
+        "contacts": [
+            {field: random_scalar(rng) for field in fields if field == "id" or rng.random() < 0.8}
+            for _ in range(rows)
+        ]
+    }
+
+
+def nested_document(rng: random.Random, rows: int) -> Dict[str, Any]:
+    return {
+        f"service-{i}": {
+            "image": f"registry/app-{i}:1.{i % 10}",
+            "replicas": i % 5 + 1,
+            "env": {f"VAR_{j}": random_string(rng) for j in range(5)},
+            "ports": [{"name": "http", "port": 8000 + i, "protocol": "TCP"}],
+            "labels": {"app": f"app-{i}", "tier": rng.choice(["web", "db", "cache"])},
+        }
+        for i in range(rows // 10 + 1)
+    }
+
+
+def list_document(rng: random.Random, rows: int) -> Dict[str, Any]:
+    return {
+        "events": [
+            {
+                "type": rng.choice(["click", "view", "error"]),
+                "tags": [random_string(rng) for _ in range(rng.randint(0, 3))],
+                "payload": {"x": rng.randint(0, 100), "path": [random_string(rng), {"depth": 2}]},
+            }
+            for _ in range(rows // 4 + 1)
+        ]
+    }
+
+
+def string_document(rng: random.Random, rows: int) -> Dict[str, Any]:
+    return {
+        "messages": [
+            {"id": f"m-{i}", "text": random_string(rng) + " " + rng.choice(_TRICKY_STRINGS)}
+            for i in range(rows)
+        ],
+        "notes": [random_string(rng) for _ in range(rows // 10 + 1)],
+    }
+
+
+DOCUMENT_CLASSES: Dict[str, Callable[[random.Random, int], Any]] = {
+    "tabular": tabular_document,
+    "sparse": sparse_document,
+    "nested": nested_document,
+    "lists": list_document,
+    "strings": string_document,
+}
+
+
+# Round-trip
+
+def corpus_documents(paths: List[Path]) -> Iterator[Tuple[str, Any]]:
+    """Documentos de los archivos del corpus (JSON, JSON Lines, YAML; comprimidos o no)"""
+    converter = Converter()
+    for path in paths:
+        for index, data in enumerate(converter.load_all(path)):
+            yield f"{path.name}#{index}", data
+
+
+def check_roundtrip(
+        name: str, data: Any, failures: List[Tuple[str, Any, str]], indent: int = 2, expected: Any = None
+) -> None:
+    """Codifica `data` y comprueba que se decodifica a `expected` (por defecto, `data`)"""
+    if expected is None:
+        expected = data
+    try:
+        toon = TOONTransformer.to_toon(data, indent=indent)
+    except Exception as e:
+        failures.append((name, data, f"encode error: {e}"))
+        return
+    # El mismo texto con líneas vacías intercaladas y con finales CRLF
+    variants = [toon, toon.replace("\n", "\n\n"), toon.replace("\n", "\r\n")]
+    for text in variants:
+        try:
+            decoded = TOONParser._parse_toon(text)
+        except Exception as e:
+            failures.append((name, data, f"decode error: {e}\n{text}"))
+            return
+        if not strict_equal(decoded, expected):
+            failures.append((name, data, f"{text}\n-> {decoded!r}"))
+            return
+
+
+def run_roundtrip(args: argparse.Namespace) -> List[Tuple[str, Any, str]]:
+    rng = random.Random(args.seed)
+    failures: List[Tuple[str, Any, str]] = []
+    checked = 0
+
+    for i in range(args.count):
+        data = random_value(rng)
+        check_roundtrip(f"random#{i}", data, failures, indent=rng.choice([2, 4]))
+        checked += 1
+
+    for name, generate in DOCUMENT_CLASSES.items():
+        for i in range(10):
+            check_roundtrip(f"{name}#{i}", generate(rng, rng.randint(0, 50)), failures)
+            checked += 1
+
+    for i, text in enumerate(_YAML_CASES):
+        for data in YAMLParser.iter_documents(text):
+            check_roundtrip(f"yaml#{i}", data, failures, expected=string_keys(data))
+            checked += 1
+
+    corpus = [Path(p) for p in args.corpus] or sorted(CORPUS_ROOT.glob("*.json"))
+    for name, data in corpus_documents(corpus):
+        check_roundtrip(name, data, failures)
+        checked += 1
+
+    print(f"round-trip: {checked - len(failures)}/{checked} documents ok")
+    return failures
+
+
+# Rendimiento
+
+def measure_throughput(rows: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """MB/s de TOON codificados y decodificados por clase (mejor de `repeat`)"""
+    results = {}
+    for name, generate in DOCUMENT_CLASSES.items():
+        data = generate(random.Random(1), rows)
+        toon = TOONTransformer.to_toon(data)
+        size = len(toon.encode('utf-8')) / 1e6
+
+        encode = min(_timed(TOONTransformer.to_toon, data) for _ in range(repeat))
+        decode = min(_timed(TOONParser._parse_toon, toon) for _ in range(repeat))
+        results[name] = {"encode_mb_s": round(size / encode, 2), "decode_mb_s": round(size / decode, 2)}
+    return results
+
+
+def _timed(func: Callable, arg: Any) -> float:
+    start = time.perf_counter()
+    func(arg)
+    return time.perf_counter() - start
+
+
+def compare_baseline(results: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Muestra el throughput y retorna las métricas por debajo de baseline * (1 - tolerance)"""
+    baseline = {}
+    if BASELINE_FILE.exists():
+        with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)["throughput"]
+    else:
+        print(f"no baseline at {BASELINE_FILE} (record one with --update-baseline)")
+
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(name, {}).get(metric)
+            note = ""
+            if expected is not None:
+                note = f"(baseline {expected:.2f})"
+                if value < expected * (1 - tolerance):
+                    note += " REGRESSION"
+                    regressions.append(f"{name}.{metric}: {value} < {expected} MB/s")
+            print(f"  {name:8} {metric:12} {value:8.2f} MB/s {note}".rstrip())
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=2000, help="Random documents to round-trip")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", nargs="*", default=[], help="Corpus files (default: *.json in the repo root)")
+    parser.add_argument("--rows", type=int, default=20000, help="Records per document for throughput")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed throughput drop vs baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--skip-perf", action="store_true")
+    args = parser.parse_args()
+
+    failures = run_roundtrip(args)
+    for name, data, detail in failures[:10]:
+        print(f"\n✗ {name}: {data!r}\n{detail}")
+
+    regressions = []
+    if not args.skip_perf:
+        results = measure_throughput(args.rows, args.repeat)
+        print("throughput:")
+        regressions = compare_baseline(results, args.tolerance)
+        if args.update_baseline:
+            with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+                json.dump({"rows": args.rows, "throughput": results}, f, indent=2)
+                f.write("\n")
+            print(f"baseline saved to {BASELINE_FILE}")
+            regressions = []
+
+    for regression in regressions:
+        print(f"✗ {regression}")
+    if failures or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -61,15 +61,20 @@ Remove-Item -Recurse -Force dist, build, *.egg-info -ErrorAction SilentlyContinu
 Print-Success "Limpieza completada"
 
 Print-Step "Verificando archivos __init__.py..."
-New-Item -ItemType Directory -Force -Path "src\models", "src\parsers", "src\transformers" | Out-Null
+New-Item -ItemType Directory -Force -Path "src\models", "src\parsers", "src\transformers", "src\utils", "src\validators" | Out-Null
 
+# src\__init__.py exporta la API publica: solo se crea si falta
+if (-not (Test-Path "src\__init__.py")) {
 @"
 __version__ = "$CURRENT_VERSION"
 "@ | Out-File -FilePath "src\__init__.py" -Encoding UTF8
+}
 
-New-Item -ItemType File -Force -Path "src\models\__init__.py" | Out-Null
-New-Item -ItemType File -Force -Path "src\parsers\__init__.py" | Out-Null
-New-Item -ItemType File -Force -Path "src\transformers\__init__.py" | Out-Null
+foreach ($pkg in "models", "parsers", "transformers", "utils", "validators") {
+    if (-not (Test-Path "src\$pkg\__init__.py")) {
+        New-Item -ItemType File -Path "src\$pkg\__init__.py" | Out-Null
+    }
+}
 
 Print-Success "Archivos __init__.py creados"
 
@@ -66,12 +66,17 @@ rm -rf dist/ build/ *.egg-info src/*.egg-info
 print_success "Limpieza completada"
 
 print_step "Verificando archivos __init__.py..."
-mkdir -p src/models src/parsers src/transformers
+mkdir -p src/models src/parsers src/transformers src/utils src/validators
 
-echo '__version__ = "'$CURRENT_VERSION'"' > src/__init__.py
+# src/__init__.py exporta la API publica: solo se crea si falta
+if [ ! -f "src/__init__.py" ]; then
+    echo '__version__ = "'$CURRENT_VERSION'"' > src/__init__.py
+fi
 touch src/models/__init__.py
 touch src/parsers/__init__.py
 touch src/transformers/__init__.py
+touch src/utils/__init__.py
+touch src/validators/__init__.py
 
 print_success "Archivos __init__.py creados"
 
@@ -1 +1,3 @@
 __version__ = "0.1.1"
+
+from .api import Converter, ConverterOptions
@@ -0,0 +1,331 @@
+"""
+API Python de tenty-parser
+
+Punto de entrada para usar la librería desde código sin pasar por la CLI:
+
+    from src import Converter
+
+    with Converter(workers=4, sparsity=0.2) as converter:
+        toon = converter.to_toon({"users": [...]})
+        for text in converter.convert_many(payloads):   # bytes, str, archivos o datos
+            ...
+        structure = converter.infer(Path("data.yaml.gz"))
+"""
+import codecs
+import io
+import json
+import os
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional, TextIO
+
+import yaml
+from pydantic import BaseModel, Field
+
+from .models.structure import DocumentStructure, StructureNode
+from .parsers.json_parser import JSONParser
+from .parsers.toon_parser import TOONParser
+from .parsers.yaml_parser import YAMLParser
+from .transformers.stats import EncodingStats
+from .transformers.to_schema import SchemaTransformer
+from .transformers.to_structure import StructureTransformer
+from .transformers.to_toon import TOONTransformer
+from .utils.io import SNIFF_SIZE, detect_format, open_input, sniff_format, sniff_stream
+from .validators.schema_validator import SchemaValidator, ValidationIssue
+
+OUTPUT_FORMATS = ("json", "jsonl", "yaml", "toon")
+
+# Separador entre documentos cuando un stream multi-documento se escribe como TOON
+TOON_DOCUMENT_SEPARATOR = "\n---\n"
+
+
+class ConverterOptions(BaseModel):
+    """Configuración de un Converter (se fija al crearlo)"""
+    indent: int = Field(2, ge=2)
+    workers: int = 1
+    chunk_size: Optional[int] = None
+    sparsity: float = TOONTransformer.TABULAR_MAX_SPARSITY
+    title: str = "Generated Schema"
+    input_format: Optional[Literal["json", "jsonl", "yaml", "toon"]] = None
+    fail_fast: bool = False
+
+
+class Converter:
+    """
+    Conversor configurado y reutilizable para procesar lotes de documentos
+
+    La configuración se resuelve una sola vez y se conserva entre llamadas:
+    el codificador TOON ya parametrizado, el pool de procesos (con
+    workers > 1, creado al primer uso y reutilizado hasta `close`) y los
+    validadores compilados por schema.
+
+    Las entradas (`source`) pueden ser:
+    - bytes / bytearray: contenido codificado, se parsea sin decodificar a str
+    - str: contenido de texto (no una ruta)
+    - un archivo abierto, en modo texto o binario
+    - os.PathLike (p. ej. pathlib.Path): ruta, con compresión transparente
+    - cualquier otro valor: datos Python ya cargados
+
+    El formato se toma del argumento `fmt`, de `options.input_format` o se
+    detecta del contenido (nombre y bytes iniciales para rutas y archivos
+    abiertos).
+    """
+
+    def __init__(self, options: Optional[ConverterOptions] = None, **overrides: Any):
+        if options is None:
+            options = ConverterOptions(**overrides)
+        elif overrides:
+            options = ConverterOptions(**{**options.model_dump(), **overrides})
+        self.options = options
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._encode = self._encoder()
+        self._validators: Dict[str, SchemaValidator] = {}
+
+    def __enter__(self) -> "Converter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Libera el pool de procesos, si se llegó a crear"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._encode = self._encoder()
+
+    def _encoder(self) -> Callable[[Any], str]:
+        """TOONTransformer.to_toon con las opciones (y el pool, si existe) ya aplicadas"""
+        options = self.options
+        if self._executor is None:
+            return partial(TOONTransformer.to_toon, indent=options.indent, sparsity=options.sparsity)
+        return partial(
+            TOONTransformer.to_toon,
+            indent=options.indent, workers=options.workers, chunk_size=options.chunk_size,
+            sparsity=options.sparsity, executor=self._executor,
+        )
+
+    # Lectura
+
+    def load(self, source: Any, fmt: Optional[str] = None) -> Any:
+        """Carga un único documento (el primero si la entrada tiene varios)"""
+        return next(iter(self.load_all(source, fmt)), None)
+
+    def load_all(self, source: Any, fmt: Optional[str] = None) -> Iterator[Any]:
+        """Carga los documentos de una entrada en streaming"""
+        return self._open(source, fmt)[0]
+
+    # Transformaciones
+
+    def to_toon(self, data: Any) -> str:
+        """Codifica datos Python a TOON con las opciones del conversor"""
+        if self.options.workers > 1 and self._executor is None:
+            # El pool se crea al primer uso y se reutiliza hasta close()
+            self._executor = ProcessPoolExecutor(max_workers=self.options.workers)
+            self._encode = self._encoder()
+        return self._encode(data)
+
+    def convert(self, source: Any, to: str = "toon", fmt: Optional[str] = None) -> str:
+        """Convierte una entrada al formato `to` (json, jsonl, yaml, toon) y retorna el texto"""
+        if to == "toon":
+            return TOON_DOCUMENT_SEPARATOR.join(map(self.to_toon, self.load_all(source, fmt)))
+        if to not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown format '{to}'")
+
+        buffer = io.StringIO()
+        write_documents(self.load_all(source, fmt), buffer, to)
+        return buffer.getvalue()
+
+    def convert_many(self, sources: Iterable[Any], to: str = "toon", fmt: Optional[str] = None) -> Iterator[str]:
+        """Convierte cada entrada de un iterable, en orden y de forma perezosa"""
+        for source in sources:
+            yield self.convert(source, to, fmt)
+
+    def infer(self, source: Any, fmt: Optional[str] = None) -> DocumentStructure:
+        """
+        Infiere la estructura de una entrada
+
+        Si la entrada tiene varios documentos (YAML multi-documento, JSON
+        Lines) la estructura es la unión de todos ellos.
+        """
+        documents, fmt = self._open(source, fmt)
+        root = None
+        count = 0
+        for data in documents:
+            node = JSONParser._analyze_value(data)
+            root = node if root is None else StructureTransformer.merge_nodes(root, node)
+            count += 1
+
+        if root is None:
+            root = StructureNode(type="null", nullable=True)
+        if fmt == "jsonl":
+            return DocumentStructure(root=root, format="json", metadata={"records": count})
+        metadata = {"documents": count} if count > 1 else {}
+        return DocumentStructure(root=root, format=fmt, metadata=metadata)
+
+    def schema(self, source: Any, title: Optional[str] = None, fmt: Optional[str] = None) -> Dict[str, Any]:
+        """Genera el JSON Schema de una entrada"""
+        return SchemaTransformer.to_json_schema(self.infer(source, fmt), title or self.options.title)
+
+    def validator(self, schema: Dict[str, Any]) -> SchemaValidator:
+        """Retorna el validador compilado de un schema (compilado una vez por conversor)"""
+        key = json.dumps(schema, sort_keys=True)
+        validator = self._validators.get(key)
+        if validator is None:
+            validator = SchemaValidator(schema, fail_fast=self.options.fail_fast)
+            self._validators[key] = validator
+        return validator
+
+    def validate(self, source: Any, schema: Dict[str, Any], fmt: Optional[str] = None) -> List[ValidationIssue]:
+        """Valida los documentos de una entrada y retorna todos sus errores"""
+        validator = self.validator(schema)
+        issues: List[ValidationIssue] = []
+        for data in self.load_all(source, fmt):
+            issues.extend(validator.validate(data))
+        return issues
+
+    def _open(self, source: Any, fmt: Optional[str]) -> tuple:
+        """Retorna (iterador de documentos, formato) para cualquier tipo de entrada"""
+        fmt = fmt or self.options.input_format
+
+        if isinstance(source, (bytes, bytearray)):
+            fmt = fmt or sniff_format(source[:SNIFF_SIZE]) or "json"
+            return _read_bytes(source, fmt), fmt
+
+        if isinstance(source, str):
+            fmt = fmt or sniff_format(source[:SNIFF_SIZE].encode('utf-8')) or "json"
+            if source.startswith('\ufeff'):
+                source = source[1:]
+            return _read_text(source, fmt), fmt
+
+        if isinstance(source, os.PathLike):
+            path = os.fspath(source)
+            fmt = fmt or detect_format(path) or "json"
+            return _read_path(path, fmt), fmt
+
+        if hasattr(source, "read"):
+            if fmt is None:
+                fmt, source = sniff_stream(source)
+                fmt = fmt or "json"
+            if fmt == "toon":
+                # El parser TOON trabaja con líneas de texto
+                source = _text_lines(source)
+            return read_documents(source, fmt), fmt
+
+        # Datos Python ya cargados
+        return iter([source]), "json"
+
+
+def _text_lines(stream: Any) -> Iterator[str]:
+    """Líneas de texto de un stream abierto en modo texto o binario"""
+    lines = iter(stream)
+    first = next(lines, None)
+    if first is None:
+        return iter(())
+    if isinstance(first, bytes):
+        return codecs.iterdecode(chain([first], lines), 'utf-8-sig')
+    return chain([first], lines)
+
+
+def _read_bytes(content: bytes, fmt: str) -> Iterator[Any]:
+    """Documentos de un contenido en bytes (json y yaml aceptan bytes sin decodificar)"""
+    if fmt == "json":
+        return iter([json.loads(content)])
+    if fmt == "jsonl":
+        return (json.loads(line) for line in content.splitlines() if line.strip())
+    if fmt == "yaml":
+        return YAMLParser.iter_documents(content)
+    return _read_text(codecs.decode(content, 'utf-8-sig'), fmt)
+
+
+def _read_text(content: str, fmt: str) -> Iterator[Any]:
+    """Documentos de un contenido de texto"""
+    if fmt == "json":
+        return iter([json.loads(content)])
+    if fmt == "toon" and '---' not in content:
+        return iter([TOONParser._parse_toon(content)])
+    return read_documents(io.StringIO(content), fmt)
+
+
+def _read_path(path: str, fmt: str) -> Iterator[Any]:
+    """Documentos de un archivo, cerrándolo al terminar de iterar"""
+    with open_input(path) as f:
+        yield from read_documents(f, fmt)
+
+
+def read_documents(stream: TextIO, fmt: str) -> Iterator[Any]:
+    """Lee los documentos de un stream en streaming (texto, o binario salvo TOON)"""
+    if fmt == "yaml":
+        return YAMLParser.iter_documents(stream)
+    if fmt == "jsonl":
+        return (json.loads(line) for line in stream if line.strip())
+    if fmt == "toon":
+        return TOONParser.iter_documents(stream)
+    return iter([json.load(stream)])
+
+
+def write_documents(
+        documents: Iterator[Any],
+        f: TextIO,
+        to_format: str,
+        to_toon: Optional[Callable[[Any], str]] = None,
+        stats: Optional[EncodingStats] = None,
+) -> int:
+    """
+    Escribe documentos en streaming y retorna cuántos se escribieron
+
+    Un único documento produce la misma salida que antes; varios documentos
+    se escriben como array JSON, una línea por documento (jsonl), un stream
+    YAML con --- o bloques TOON separados por ---. `to_toon` es el
+    codificador TOON a usar (por defecto TOONTransformer.to_toon).
+    """
+    head = list(islice(documents, 2))
+    multiple = len(head) > 1
+    documents = chain(head, documents)
+    count = 0
+
+    if to_format == "json":
+        if not multiple:
+            json.dump(head[0] if head else None, f, indent=2)
+            return len(head)
+        f.write("[\n")
+        for doc in documents:
+            if count:
+                f.write(",\n")
+            f.write(textwrap.indent(json.dumps(doc, indent=2), "  "))
+            count += 1
+        f.write("\n]")
+
+    elif to_format == "jsonl":
+        if not multiple and head and isinstance(head[0], list):
+            # Un único array se escribe como un registro por línea
+            documents = iter(head[0])
+        for doc in documents:
+            f.write(json.dumps(doc, separators=(",", ":")))
+            f.write("\n")
+            count += 1
+
+    elif to_format == "yaml":
+        def counted():
+            nonlocal count
+            for doc in documents:
+                count += 1
+                yield doc
+
+        yaml.dump_all(counted(), f, default_flow_style=False, allow_unicode=True)
+
+    elif to_format == "toon":
+        encode = to_toon or TOONTransformer.to_toon
+        for doc in documents:
+            if count:
+                f.write(TOON_DOCUMENT_SEPARATOR)
+            toon_output = encode(doc)
+            f.write(toon_output)
+            if stats is not None:
+                stats.add_document(doc, toon_output)
+            count += 1
+
+    return count
@@ -1,8 +1,12 @@
 import typer
 import json
+import os
+import time
 from pathlib import Path
+from typing import List, Optional
 from rich.console import Console
 from rich.syntax import Syntax
+from rich.table import Table
 from rich.tree import Tree
 
 from .parsers.json_parser import JSONParser
@@ -11,93 +15,153 @@ from .parsers.yaml_parser import YAMLParser
 from .transformers.to_toon import TOONTransformer
 from .parsers.toon_parser import TOONParser
 from .transformers.to_schema import SchemaTransformer
+from .transformers.incremental import IncrementalEncoder
+from .transformers.stats import CountingReader, EncodingStats
+from .validators.schema_validator import SchemaValidator
+from .models.structure import DocumentStructure
+from .api import OUTPUT_FORMATS, TOON_DOCUMENT_SEPARATOR, Converter, read_documents, write_documents
+from .utils.io import STDIO, FORMAT_SUFFIXES, detect_format, open_input, open_output, split_suffix
 
 app = typer.Typer(
     name="tenty-parser",
     help="Parse and transform structured data formats (JSON, YAML, TOON)"
 )
 console = Console()
+# Mensajes de estado cuando stdout lleva los datos ("-o -")
+err_console = Console(stderr=True)
 
 
 @app.command()
 def parse(
-        file: Path = typer.Argument(..., help="Input file to parse (JSON or YAML)"),
+        file: Path = typer.Argument(..., help="Input file to parse (JSON, YAML, TOON; '-' for stdin)"),
         output: Path = typer.Option(None, "--output", "-o", help="Output file (optional)"),
         format: str = typer.Option("tree", "--format", "-f", help="Output format: tree, json, schema, toon"),
-        show_examples: bool = typer.Option(True, "--examples/--no-examples", help="Show example values")
+        show_examples: bool = typer.Option(True, "--examples/--no-examples", help="Show example values"),
+        per_document: bool = typer.Option(False, "--per-document", help="One structure per YAML document instead of a merged one"),
+        workers: int = typer.Option(1, "--workers", "-j", help="Worker processes for multi-document YAML inference"),
+        from_format: str = typer.Option(None, "--from", help="Input format: json, jsonl, yaml, toon (default: detect)"),
+        show_stats: bool = typer.Option(False, "--stats", help="Show size/token savings (toon format)"),
+        stats_json: Path = typer.Option(None, "--stats-json", help="Append size/token stats to a JSON report (toon format; implies --stats)")
 ):
     """
     Parse a JSON/YAML file and display its structure
+
+    Compressed input (.gz, .bz2, .xz) is decompressed transparently.
     """
 
-    if not file.exists():
-        console.print(f"[red]Error:[/red] File '{file}' not found")
-        raise typer.Exit(1)
+    # Si los datos van a stdout, los mensajes van a stderr y no hay vista previa
+    to_stdout = output is not None and str(output) == STDIO
+    log = err_console if to_stdout else console
 
-    # Detectar tipo de archivo
-    file_ext = file.suffix.lower()
+    # Detectar tipo de archivo (a través de la compresión)
+    file_format = _input_format(file, from_format, log)
 
-    console.print(f"[cyan]Parsing:[/cyan] {file}")
+    log.print(f"[cyan]Parsing:[/cyan] {file}")
 
-    try:
-        if file_ext in ['.yaml', '.yml']:
-            structure = YAMLParser.parse_file(str(file))
-        elif file_ext == '.json':
-            structure = JSONParser.parse_file(str(file))
-        elif file_ext == '.toon':
-            structure = TOONParser.parse_file(str(file))
-        else:
-            console.print(f"[yellow]Warning:[/yellow] Unknown extension, trying JSON parser")
-            structure = JSONParser.parse_file(str(file))
-    except Exception as e:
-        console.print(f"[red]Error parsing file:[/red] {e}")
-        raise typer.Exit(1)
+    if format != "toon":
+        try:
+            structures = _load_structures(str(file), file_format, per_document, workers)
+        except Exception as e:
+            log.print(f"[red]Error parsing file:[/red] {e}")
+            raise typer.Exit(1)
 
     # Generar output según formato
     if format == "tree":
-        tree = _build_tree(structure.root)
-        console.print(tree)
+        for index, structure in enumerate(structures):
+            tree = _build_tree(structure.root, f"document {index}" if per_document else "root")
+            console.print(tree)
 
     elif format == "json":
-        simple = StructureTransformer.to_simple_dict(structure)
-        syntax = Syntax(json.dumps(simple, indent=2), "json", theme="monokai")
-        console.print(syntax)
+        simple = [StructureTransformer.to_simple_dict(s) for s in structures]
+        if not per_document:
+            simple = simple[0]
+        if not to_stdout:
+            syntax = Syntax(json.dumps(simple, indent=2), "json", theme="monokai")
+            console.print(syntax)
 
         if output:
-            with open(output, 'w', encoding='utf-8') as f:
+            with open_output(str(output)) as f:
                 json.dump(simple, f, indent=2)
-            console.print(f"[green]✓[/green] Saved to {output}")
+            log.print(f"[green]✓[/green] Saved to {output}")
 
     elif format == "schema":
-        schema = StructureTransformer.to_schema_like(structure)
-        syntax = Syntax(json.dumps(schema, indent=2), "json", theme="monokai")
-        console.print(syntax)
+        schema = [StructureTransformer.to_schema_like(s) for s in structures]
+        if not per_document:
+            schema = schema[0]
+        if not to_stdout:
+            syntax = Syntax(json.dumps(schema, indent=2), "json", theme="monokai")
+            console.print(syntax)
 
         if output:
-            with open(output, 'w', encoding='utf-8') as f:
+            with open_output(str(output)) as f:
                 json.dump(schema, f, indent=2)
-            console.print(f"[green]✓[/green] Saved to {output}")
+            log.print(f"[green]✓[/green] Saved to {output}")
 
     elif format == "toon":
-        # utf-8-sig para manejar BOM
-        with open(file, 'r', encoding='utf-8-sig') as f:
-            if file_ext in ['.yaml', '.yml']:
-                import yaml
-                data = yaml.safe_load(f)
-            else:
-                data = json.load(f)
-
-        toon_output = TOONTransformer.to_toon(data)
-        syntax = Syntax(toon_output, "yaml", theme="monokai")
-        console.print(syntax)
+        stats = EncodingStats(file=str(file)) if show_stats or stats_json else None
+        try:
+            with open_input(str(file)) as f:
+                documents = read_documents(CountingReader(f, stats) if stats else f, file_format)
+                parts = []
+                for doc in documents:
+                    parts.append(TOONTransformer.to_toon(doc))
+                    if stats:
+                        stats.add_document(doc, parts[-1])
+                toon_output = TOON_DOCUMENT_SEPARATOR.join(parts)
+        except Exception as e:
+            log.print(f"[red]Error parsing file:[/red] {e}")
+            raise typer.Exit(1)
+
+        if not to_stdout:
+            syntax = Syntax(toon_output, "yaml", theme="monokai")
+            console.print(syntax)
+        if stats:
+            _report_stats(stats, stats_json, log)
 
         if output:
-            with open(output, 'w', encoding='utf-8') as f:
+            with open_output(str(output)) as f:
                 f.write(toon_output)
 
-            console.print(f"[green]✓[/green] Saved to {output}")
+            log.print(f"[green]✓[/green] Saved to {output}")
+
+    log.print("\n[green]✓[/green] Parsing complete!")
+
+
+def _input_format(file: Path, from_format: Optional[str], log: Console = console) -> str:
+    """Verifica que la entrada exista y retorna su formato de datos"""
+    path = str(file)
+    if path != STDIO and not file.exists():
+        log.print(f"[red]Error:[/red] File '{file}' not found")
+        raise typer.Exit(1)
+
+    if from_format:
+        return from_format
+
+    try:
+        file_format = detect_format(path)
+    except OSError as e:
+        log.print(f"[red]Error reading file:[/red] {e}")
+        raise typer.Exit(1)
+
+    if file_format is None:
+        log.print("[yellow]Warning:[/yellow] Unknown format, trying JSON parser")
+        return "json"
+    return file_format
 
-    console.print(f"\n[green]✓[/green] Parsing complete!")
+
+def _load_structures(
+        path: str, file_format: str, per_document: bool = False, workers: int = 1
+) -> List[DocumentStructure]:
+    """Infiere la estructura de un archivo según su formato"""
+    if file_format == "yaml":
+        if per_document:
+            return list(YAMLParser.parse_documents(path, workers))
+        return [YAMLParser.parse_file(path, workers)]
+    if file_format == "jsonl":
+        return [JSONParser.parse_lines_file(path)]
+    if file_format == "toon":
+        return [TOONParser.parse_file(path)]
+    return [JSONParser.parse_file(path)]
 
 
 def _build_tree(node, name: str = "root") -> Tree:
@@ -123,84 +187,102 @@ def _build_tree(node, name: str = "root") -> Tree:
 
 @app.command()
 def convert(
-        input_file: Path = typer.Argument(..., help="Input file"),
-        output_file: Path = typer.Argument(..., help="Output file"),
-        to_format: str = typer.Option("json", "--to", "-t", help="Target format: json, yaml, toon")
+        input_file: Path = typer.Argument(..., help="Input file ('-' for stdin)"),
+        output_file: Path = typer.Argument(..., help="Output file ('-' for stdout)"),
+        to_format: str = typer.Option("json", "--to", "-t", help="Target format: json, jsonl, yaml, toon"),
+        from_format: str = typer.Option(None, "--from", help="Input format: json, jsonl, yaml, toon (default: detect)"),
+        workers: int = typer.Option(1, "--workers", "-j", help="Worker processes for TOON encoding of large arrays"),
+        sparsity: float = typer.Option(
+            TOONTransformer.TABULAR_MAX_SPARSITY, "--sparsity",
+            help="Max fraction of missing cells for tabular TOON arrays (0 = identical keys only)"
+        ),
+        show_stats: bool = typer.Option(False, "--stats", help="Show size/token savings (toon output)"),
+        stats_json: Path = typer.Option(None, "--stats-json", help="Append size/token stats to a JSON report (toon output; implies --stats)")
 ):
     """
     Convert between different formats (JSON, YAML, TOON)
+
+    Multi-document YAML and JSON Lines are streamed one document at a time.
+    Compression (.gz, .bz2, .xz) is handled transparently on both sides.
     """
+    # Si los datos van a stdout, los mensajes van a stderr
+    log = err_console if str(output_file) == STDIO else console
 
-    if not input_file.exists():
-        console.print(f"[red]Error:[/red] File '{input_file}' not found")
+    file_format = _input_format(input_file, from_format, log)
+
+    if to_format not in OUTPUT_FORMATS:
+        log.print(f"[red]Error:[/red] Unknown format '{to_format}'")
         raise typer.Exit(1)
 
-    console.print(f"[cyan]Converting:[/cyan] {input_file} → {output_file}")
+    log.print(f"[cyan]Converting:[/cyan] {input_file} → {output_file}")
+
+    # Las estadísticas (opcionales) se acumulan mientras se lee y se codifica
+    stats = EncodingStats(file=str(input_file)) if to_format == "toon" and (show_stats or stats_json) else None
 
-    # Leer archivo de entrada
     try:
-        file_ext = input_file.suffix.lower()
-        # utf-8-sig para manejar BOM
-        with open(input_file, 'r', encoding='utf-8-sig') as f:
-            if file_ext in ['.yaml', '.yml']:
-                import yaml
-                data = yaml.safe_load(f)
-            else:
-                data = json.load(f)
+        with open_input(str(input_file)) as src, open_output(str(output_file)) as dst:
+            reader = CountingReader(src, stats) if stats else src
+            with Converter(workers=workers, sparsity=sparsity) as converter:
+                count = write_documents(read_documents(reader, file_format), dst, to_format, converter.to_toon, stats)
     except Exception as e:
-        console.print(f"[red]Error reading file:[/red] {e}")
+        log.print(f"[red]Error converting file:[/red] {e}")
         raise typer.Exit(1)
 
-    # Convertir al formato de salida
-    try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            if to_format == "json":
-                json.dump(data, f, indent=2)
-            elif to_format == "yaml":
-                import yaml
-                yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
-            elif to_format == "toon":
-                toon_output = TOONTransformer.to_toon(data)
-                f.write(toon_output)
-            else:
-                console.print(f"[red]Error:[/red] Unknown format '{to_format}'")
-                raise typer.Exit(1)
+    documents_note = f" ({count} documents)" if count > 1 else ""
+    log.print(f"[green]✓[/green] Converted successfully to {to_format.upper()}{documents_note}")
+
+    if stats:
+        _report_stats(stats, stats_json, log)
 
-        console.print(f"[green]✓[/green] Converted successfully to {to_format.upper()}")
-    except Exception as e:
-        console.print(f"[red]Error writing file:[/red] {e}")
-        raise typer.Exit(1)
+
+def _report_stats(stats: EncodingStats, stats_json: Optional[Path], log: Console = console) -> None:
+    """Muestra bytes y tokens estimados (fuente, JSON minificado, TOON) y los exporta"""
+    stats.finish()
+    table = Table(title="Size and estimated tokens", title_justify="left")
+    table.add_column("")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Tokens (approx.)", justify="right")
+    table.add_column("TOON saving", justify="right")
+
+    rows = [
+        ("Source", stats.source_bytes, stats.source_tokens),
+        ("JSON (minified)", stats.json_bytes, stats.json_tokens),
+        ("TOON", stats.toon_bytes, stats.toon_tokens),
+    ]
+    for name, size, tokens in rows:
+        saving = "" if name == "TOON" else f"{EncodingStats.saving(tokens, stats.toon_tokens):.1f}%"
+        table.add_row(name, f"{size:,}", f"{tokens:,}", saving)
+    log.print(table)
+
+    if stats_json:
+        EncodingStats.export([stats], str(stats_json))
+        log.print(f"[green]✓[/green] Stats saved to {stats_json}")
 
 
 @app.command()
 def schema(
-        file: Path = typer.Argument(..., help="Input file to generate schema from"),
+        file: Path = typer.Argument(..., help="Input file to generate schema from ('-' for stdin)"),
         output: Path = typer.Option(None, "--output", "-o", help="Output file (optional)"),
         title: str = typer.Option("Generated Schema", "--title", "-t", help="Schema title"),
-        format: str = typer.Option("jsonschema", "--format", "-f", help="Schema format: jsonschema, openapi")
+        format: str = typer.Option("jsonschema", "--format", "-f", help="Schema format: jsonschema, openapi"),
+        from_format: str = typer.Option(None, "--from", help="Input format: json, jsonl, yaml, toon (default: detect)")
 ):
     """
     Generate JSON Schema or OpenAPI Schema from a file
     """
-    if not file.exists():
-        console.print(f"[red]Error:[/red] File '{file}' not found")
-        raise typer.Exit(1)
+    # Si el schema va a stdout, los mensajes van a stderr
+    to_stdout = output is not None and str(output) == STDIO
+    log = err_console if to_stdout else console
 
-    console.print(f"[cyan]Generating schema from:[/cyan] {file}")
+    file_format = _input_format(file, from_format, log)
+
+    log.print(f"[cyan]Generating schema from:[/cyan] {file}")
 
     # Parse file
-    file_ext = file.suffix.lower()
     try:
-        if file_ext in ['.yaml', '.yml']:
-            structure = YAMLParser.parse_file(str(file))
-        elif file_ext == '.json':
-            structure = JSONParser.parse_file(str(file))
-        elif file_ext == '.toon':
-            structure = TOONParser.parse_file(str(file))
-        else:
-            structure = JSONParser.parse_file(str(file))
+        structure = _load_structures(str(file), file_format)[0]
     except Exception as e:
-        console.print(f"[red]Error:[/red] {e}")
+        log.print(f"[red]Error:[/red] {e}")
         raise typer.Exit(1)
 
     # Generate schema
@@ -209,18 +291,199 @@ def schema(
     elif format == "openapi":
         schema = SchemaTransformer.to_openapi_schema(structure, title)
     else:
-        console.print(f"[red]Error:[/red] Unknown format '{format}'")
+        log.print(f"[red]Error:[/red] Unknown format '{format}'")
         raise typer.Exit(1)
 
     # Display
-    syntax = Syntax(json.dumps(schema, indent=2), "json", theme="monokai")
-    console.print(syntax)
+    if not to_stdout:
+        syntax = Syntax(json.dumps(schema, indent=2), "json", theme="monokai")
+        console.print(syntax)
 
     # Save
     if output:
-        with open(output, 'w', encoding='utf-8') as f:
+        with open_output(str(output)) as f:
             json.dump(schema, f, indent=2)
-        console.print(f"[green]✓[/green] Saved to {output}")
+        log.print(f"[green]✓[/green] Saved to {output}")
+
+
+@app.command()
+def validate(
+        files: List[Path] = typer.Argument(..., help="Data files to validate (JSON, JSON Lines, YAML or TOON; '-' for stdin)"),
+        schema_file: Path = typer.Option(..., "--schema", "-s", help="JSON Schema file"),
+        workers: int = typer.Option(1, "--workers", "-j", help="Worker processes for JSON Lines input"),
+        fail_fast: bool = typer.Option(False, "--fail-fast/--all-errors", help="Stop at the first error or collect all"),
+        max_errors: int = typer.Option(None, "--max-errors", help="Stop after N invalid records"),
+        chunk_size: int = typer.Option(1000, "--chunk-size", help="Records per worker batch"),
+        show: int = typer.Option(20, "--show", help="Maximum invalid records to display")
+):
+    """
+    Validate records against a JSON Schema (compiled once, streamed)
+    """
+    if not schema_file.exists():
+        console.print(f"[red]Error:[/red] File '{schema_file}' not found")
+        raise typer.Exit(1)
+
+    try:
+        validator = SchemaValidator.from_file(str(schema_file), fail_fast=fail_fast)
+    except Exception as e:
+        console.print(f"[red]Error loading schema:[/red] {e}")
+        raise typer.Exit(1)
+
+    any_invalid = False
+    for file in files:
+        if str(file) != STDIO and not file.exists():
+            console.print(f"[red]Error:[/red] File '{file}' not found")
+            raise typer.Exit(1)
+
+        console.print(f"[cyan]Validating:[/cyan] {file}")
+        try:
+            report = validator.validate_file(
+                str(file), workers=workers, chunk_size=chunk_size, max_errors=max_errors, max_results=show
+            )
+        except Exception as e:
+            console.print(f"[red]Error reading file:[/red] {e}")
+            raise typer.Exit(1)
+
+        for result in report.results[:show]:
+            for issue in result.issues:
+                console.print(
+                    f"  [red]✗[/red] {report.location} {result.index}: "
+                    f"[yellow]{issue.format_path()}[/yellow] {issue.message}"
+                )
+        if report.invalid > show:
+            console.print(f"  [dim]... {report.invalid - show} more invalid records[/dim]")
+
+        status = "[green]✓[/green]" if report.invalid == 0 else "[red]✗[/red]"
+        stopped = " [dim](stopped early)[/dim]" if report.stopped_early else ""
+        console.print(
+            f"{status} {report.valid}/{report.records} valid "
+            f"in {report.elapsed:.3f}s ({report.records_per_second:,.0f} records/s){stopped}"
+        )
+        any_invalid = any_invalid or report.invalid > 0
+
+    if any_invalid:
+        raise typer.Exit(1)
+
+
+@app.command()
+def watch(
+        paths: List[Path] = typer.Argument(..., help="JSON/YAML files to watch"),
+        to_format: str = typer.Option("toon", "--to", "-t", help="Artifact to keep in sync: toon, none"),
+        schema: bool = typer.Option(False, "--schema", help="Also keep a JSON Schema (<name>.schema.json) in sync"),
+        output_dir: Path = typer.Option(None, "--output-dir", "-d", help="Directory for artifacts (default: next to each file)"),
+        interval: float = typer.Option(0.5, "--interval", help="Polling interval in seconds"),
+        title: str = typer.Option("Generated Schema", "--title", help="Schema title")
+):
+    """
+    Watch files and incrementally re-encode them to TOON / JSON Schema on change
+
+    Only the subtrees that changed since the previous version are re-encoded;
+    the rest is spliced from cache.
+    """
+    if to_format not in ("toon", "none"):
+        console.print(f"[red]Error:[/red] Unknown format '{to_format}'")
+        raise typer.Exit(1)
+
+    for path in paths:
+        if not path.exists():
+            console.print(f"[red]Error:[/red] File '{path}' not found")
+            raise typer.Exit(1)
+
+    if output_dir is not None:
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            console.print(f"[red]Error:[/red] Cannot create output directory '{output_dir}': {e}")
+            raise typer.Exit(1)
+
+    # Un artefacto que coincide con un archivo vigilado (p. ej. vigilar data.toon
+    # con --to toon) lo sobrescribiría y se re-dispararía en cada escritura
+    watched = {path.resolve() for path in paths}
+    for path in paths:
+        for artifact in _artifact_paths(path, to_format == "toon", schema, output_dir):
+            if artifact.resolve() in watched:
+                console.print(f"[red]Error:[/red] Artifact '{artifact}' would overwrite a watched file")
+                raise typer.Exit(1)
+
+    # Por archivo: firma (mtime, tamaño) de la última versión y su encoder
+    signatures = {path: None for path in paths}
+    encoders = {path: IncrementalEncoder(title=title) for path in paths}
+
+    console.print(f"[cyan]Watching:[/cyan] {', '.join(str(p) for p in paths)} [dim](Ctrl+C to stop)[/dim]")
+    try:
+        while True:
+            for path in paths:
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if signature == signatures[path]:
+                    continue
+                signatures[path] = signature
+                _sync_artifacts(path, encoders[path], to_format == "toon", schema, output_dir)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        console.print("\n[green]✓[/green] Stopped watching")
+
+
+def _artifact_paths(path: Path, write_toon: bool, write_schema: bool, output_dir: Optional[Path]) -> List[Path]:
+    """Rutas de los artefactos de un archivo vigilado (<name>.toon, <name>.schema.json)"""
+    # data.json.gz -> data
+    name = path.name
+    suffix, compression = split_suffix(name)
+    if compression:
+        name = name.rsplit('.', 1)[0]
+    if suffix in FORMAT_SUFFIXES:
+        name = name[:-len(suffix)]
+    directory = output_dir or path.parent
+
+    artifacts = []
+    if write_toon:
+        artifacts.append(directory / f"{name}.toon")
+    if write_schema:
+        artifacts.append(directory / f"{name}.schema.json")
+    return artifacts
+
+
+def _sync_artifacts(
+        path: Path, encoder: IncrementalEncoder, write_toon: bool, write_schema: bool, output_dir: Optional[Path]
+) -> None:
+    """Re-decodifica un archivo vigilado y actualiza sus artefactos"""
+    start = time.perf_counter()
+    try:
+        file_format = detect_format(str(path)) or "json"
+        with open_input(str(path)) as f:
+            documents = list(read_documents(f, file_format))
+        if len(documents) != 1:
+            raise ValueError(f"expected a single document, found {len(documents)}")
+        toon_output, schema = encoder.update(documents[0])
+    except Exception as e:
+        # Puede ser un guardado a medias o un documento que no se puede
+        # codificar; se informa y se reintenta en el próximo cambio
+        console.print(f"[red]✗[/red] {path}: {e}")
+        return
+
+    contents = []
+    if write_toon:
+        contents.append(toon_output)
+    if write_schema:
+        contents.append(json.dumps(schema, indent=2))
+    for artifact, content in zip(_artifact_paths(path, write_toon, write_schema, output_dir), contents):
+        try:
+            with open(artifact, 'w', encoding='utf-8') as f:
+                f.write(content)
+        except OSError as e:
+            # Un artefacto que no se puede escribir no detiene la vigilancia
+            console.print(f"[red]✗[/red] {artifact}: {e}")
+
+    elapsed = (time.perf_counter() - start) * 1000
+    changed = ", ".join(encoder.changed[:5]) + (" ..." if len(encoder.changed) > 5 else "")
+    console.print(
+        f"[green]✓[/green] {path}: {len(encoder.changed)} subtrees re-encoded "
+        f"in {elapsed:.1f} ms [dim]{changed}[/dim]"
+    )
+
 
 @app.command()
 def version():
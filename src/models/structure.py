@@ -1,11 +1,12 @@
 from pydantic import BaseModel, Field
-from typing import Any, Dict, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 
 
 class StructureNode(BaseModel):
     """Representa un nodo en la estructura del documento"""
-    type: Literal["object", "array", "string", "number", "boolean", "null", "integer", "float"]
+    type: Literal["object", "array", "string", "number", "boolean", "null", "integer", "float", "any"]
     description: Optional[str] = None
+    types: Optional[List[str]] = None  # Para any: tipos observados al unir estructuras
     children: Optional[Dict[str, "StructureNode"]] = None  # Para objects
     items: Optional["StructureNode"] = None  # Para arrays
     example: Optional[Any] = None
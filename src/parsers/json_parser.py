@@ -1,6 +1,7 @@
 import json
 from typing import Any
 from ..models.structure import StructureNode, DocumentStructure
+from ..utils.io import open_input
 
 class JSONParser:
     """Parser para archivos JSON"""
@@ -14,12 +15,35 @@ class JSONParser:
 
     @staticmethod
     def parse_file(filepath: str) -> DocumentStructure:
-        """Parse JSON file a DocumentStructure"""
-        # utf-8-sig para manejar BOM en Windows
-        with open(filepath, 'r', encoding='utf-8-sig') as f:
+        """Parse JSON file a DocumentStructure (admite compresión y "-" para stdin)"""
+        with open_input(filepath) as f:
             content = f.read()
         return JSONParser.parse(content)
 
+    @staticmethod
+    def parse_lines_file(filepath: str) -> DocumentStructure:
+        """
+        Parse JSON Lines a DocumentStructure
+
+        Los registros se leen línea a línea y la estructura resultante es
+        la unión de todos ellos, así que la memoria no depende del tamaño.
+        """
+        from ..transformers.to_structure import StructureTransformer
+
+        root = None
+        records = 0
+        with open_input(filepath) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                node = JSONParser._analyze_value(json.loads(line))
+                root = node if root is None else StructureTransformer.merge_nodes(root, node)
+                records += 1
+
+        if root is None:
+            root = StructureNode(type="null", nullable=True)
+        return DocumentStructure(root=root, format="json", metadata={"records": records})
+
     @staticmethod
     def _analyze_value(value: Any, max_depth: int = 10, current_depth: int = 0) -> StructureNode:
         """Analiza un valor y retorna su estructura"""
@@ -1,5 +1,21 @@
-from typing import Any, List
+import re
+from typing import Any, Iterable, Iterator, List
 from ..models.structure import DocumentStructure
+from ..transformers.to_toon import TOONTransformer
+from ..utils.io import open_input
+from ..utils.quoting import NUMBER, split_values, unquote_key, unquote_string
+
+# Clave: entre comillas o texto sin separadores (no empieza por '-' ni '#')
+_KEY = r'"(?:[^"\\]|\\.)*"|[^\s"\[\]{}:,#-][^"\[\]{}:,]*?'
+
+# Cabecera de array: key[N]:, key[N]: a, b, key[N]{cols}: (la clave es opcional)
+_HEADER = re.compile(
+    rf'(?P<key>{_KEY})?\[(?P<size>\d+)\]'
+    r'(?:\{(?P<cols>(?:"(?:[^"\\]|\\.)*"|[^}"])*)\})?:(?P<rest>.*)'
+)
+
+# Propiedad: key: valor o key: (objeto anidado en las líneas siguientes)
+_PROPERTY = re.compile(rf'(?P<key>{_KEY}):(?P<value>.*)')
 
 
 class TOONParser:
@@ -19,85 +35,107 @@ class TOONParser:
 
     @staticmethod
     def parse_file(filepath: str) -> DocumentStructure:
-        """Parse TOON file a DocumentStructure"""
-        # utf-8-sig para manejar BOM en Windows
-        with open(filepath, 'r', encoding='utf-8-sig') as f:
+        """Parse TOON file a DocumentStructure (admite compresión y "-" para stdin)"""
+        with open_input(filepath) as f:
             content = f.read()
         return TOONParser.parse(content)
 
+    @staticmethod
+    def iter_documents(lines: Iterable[str]) -> Iterator[Any]:
+        """
+        Lee un stream TOON documento a documento
+
+        Los documentos se separan con una línea "---", igual que los escribe
+        `convert` para entradas YAML multi-documento.
+        """
+        buffer: List[str] = []
+        for line in lines:
+            if line.rstrip('\r\n') == '---':
+                yield TOONParser._parse_toon(''.join(buffer))
+                buffer = []
+            else:
+                buffer.append(line)
+        if buffer:
+            yield TOONParser._parse_toon(''.join(buffer))
+
     @staticmethod
     def _parse_toon(content: str) -> Any:
         """
-        Convierte contenido TOON a estructura Python (dict/list)
+        Convierte contenido TOON a estructura Python
 
-        Esta es una implementación básica. Para producción,
-        necesitarías un parser más robusto.
+        El documento puede ser un objeto (propiedades), un array con
+        cabecera ([N]:, [N]{cols}:, [a, b]) o un valor simple. Las líneas
+        vacías y los comentarios (#) se ignoran en cualquier posición.
         """
-        lines = content.strip().split('\n')
-        # Filtrar comentarios
-        lines = [line for line in lines if not line.strip().startswith('#')]
+        lines = [
+            line for line in content.split('\n')
+            if line.strip() and not line.lstrip().startswith('#')
+        ]
 
         if not lines:
             return {}
 
-        return TOONParser._parse_lines(lines, 0)[0]
+        return TOONParser._parse_block(lines, 0, -1)[0]
+
+    @staticmethod
+    def _parse_block(lines: List[str], start_idx: int, parent_indent: int) -> tuple:
+        """
+        Parsea el valor que empieza en `start_idx` (objeto, array o valor simple)
+
+        Las líneas que pertenecen al valor son las que tienen más indentación
+        que `parent_indent`. Retorna (valor_parseado, índice_siguiente).
+        """
+        stripped = lines[start_idx].strip()
+
+        header = _HEADER.fullmatch(stripped)
+        if header is not None and header.group('key') is None:
+            return TOONParser._parse_array(lines, start_idx, header, parent_indent)
+
+        if header is not None or _PROPERTY.match(stripped):
+            return TOONParser._parse_lines(lines, start_idx, parent_indent)
+
+        return TOONParser._parse_value(stripped), start_idx + 1
 
     @staticmethod
     def _parse_lines(lines: List[str], start_idx: int, parent_indent: int = -1) -> tuple:
         """
-        Parsea líneas TOON recursivamente
-        Retorna (valor_parseado, índice_siguiente)
+        Parsea las propiedades de un objeto
+        Retorna (objeto_parseado, índice_siguiente)
         """
         result = {}
         idx = start_idx
 
         while idx < len(lines):
             line = lines[idx]
-
-            # Línea vacía
-            if not line.strip():
-                idx += 1
-                continue
+            stripped = line.lstrip()
 
             # Calcular indentación
-            indent = len(line) - len(line.lstrip())
+            indent = len(line) - len(stripped)
 
             # Si la indentación es menor o igual al padre, terminar este nivel
-            if parent_indent >= 0 and indent <= parent_indent:
+            if indent <= parent_indent:
                 break
 
-            stripped = line.strip()
-
-            # Detectar formato tabular: key[N]{cols}:
-            if '[' in stripped and '{' in stripped and stripped.endswith(':'):
-                key, array_data = TOONParser._parse_tabular_array(lines, idx)
-                result[key] = array_data
-                # Saltar las líneas del array
-                idx += len(array_data) + 1
-                continue
-
-            # Detectar array simple: key[N]: val1, val2
-            if '[' in stripped and ']:' in stripped and '{' not in stripped:
-                key, array_data = TOONParser._parse_simple_array(stripped)
-                result[key] = array_data
-                idx += 1
-                continue
-
-            # Detectar objeto: key:
-            if ':' in stripped and not stripped.startswith('-'):
-                parts = stripped.split(':', 1)
-                key = parts[0].strip()
-                value_part = parts[1].strip() if len(parts) > 1 else ""
-
+            stripped = stripped.rstrip()
+
+            # Array: key[N]{cols}:, key[N]: val1, val2 o key[N]: con elementos "- "
+            if '[' in stripped:
+                header = _HEADER.fullmatch(stripped)
+                if header is not None and header.group('key') is not None:
+                    key = unquote_key(header.group('key'))
+                    result[key], idx = TOONParser._parse_array(lines, idx, header, indent)
+                    continue
+
+            # Propiedad: key: valor, o key: seguido de un objeto anidado
+            prop = _PROPERTY.match(stripped)
+            if prop is not None:
+                key = unquote_key(prop.group('key'))
+                value_part = prop.group('value').strip()
                 if value_part:
-                    # Valor simple en la misma línea
                     result[key] = TOONParser._parse_value(value_part)
                     idx += 1
                 else:
-                    # Objeto anidado o array
-                    nested_value, next_idx = TOONParser._parse_lines(lines, idx + 1, indent)
-                    result[key] = nested_value
-                    idx = next_idx
+                    result[key], idx = TOONParser._parse_lines(lines, idx + 1, indent)
                 continue
 
             idx += 1
@@ -105,65 +143,120 @@ class TOONParser:
         return result, idx
 
     @staticmethod
-    def _parse_tabular_array(lines: List[str], start_idx: int) -> tuple:
+    def _parse_array(lines: List[str], start_idx: int, header: re.Match, base_indent: int) -> tuple:
         """
-        Parsea un array tabular TOON
+        Parsea un array a partir de su cabecera
 
-        Ejemplo:
-        users[2]{id,name,role}:
-          1,Alice,admin
-          2,Bob,user
+        Las filas o elementos son las líneas siguientes con más indentación
+        que `base_indent`. Retorna (lista, índice_siguiente).
         """
-        header_line = lines[start_idx].strip()
+        if header.group('cols') is not None:
+            columns = [unquote_key(col) for col in split_values(header.group('cols'))]
+            return TOONParser._parse_tabular_array(lines, start_idx + 1, columns, base_indent)
+
+        rest = header.group('rest').strip()
+        if rest or header.group('size') == '0':
+            return TOONParser._parse_simple_array(rest), start_idx + 1
 
-        # Extraer key y columnas
-        key = header_line.split('[')[0]
-        cols_part = header_line.split('{')[1].split('}')[0]
-        columns = [col.strip() for col in cols_part.split(',')]
+        return TOONParser._parse_list_items(lines, start_idx + 1, base_indent)
+
+    @staticmethod
+    def _parse_tabular_array(lines: List[str], start_idx: int, columns: List[str], base_indent: int) -> tuple:
+        """
+        Parsea las filas de un array tabular TOON
 
-        # Parsear filas
+        Ejemplo:
+        users[3]{id,name,role}:
+          1,Alice,admin
+          2,Bob,-
+          3,Carol,user
+        """
+        # Parsear filas; las celdas repetidas se convierten una sola vez
         result = []
-        idx = start_idx + 1
-        base_indent = len(lines[start_idx]) - len(lines[start_idx].lstrip())
+        cache = {}
+        cache_size = TOONTransformer.CELL_CACHE_SIZE
+        missing = TOONTransformer.MISSING
+        idx = start_idx
 
         while idx < len(lines):
             line = lines[idx]
-            if not line.strip():
-                idx += 1
-                continue
-
             indent = len(line) - len(line.lstrip())
             if indent <= base_indent:
                 break
 
-            # Parsear valores de la fila
-            values = [v.strip() for v in line.strip().split(',')]
+            # Parsear valores de la fila (las celdas MISSING se omiten)
             row = {}
-            for col, val in zip(columns, values):
-                row[col] = TOONParser._parse_value(val)
+            for col, val in zip(columns, split_values(line.strip())):
+                if val == missing:
+                    continue
+                if val in cache:
+                    row[col] = cache[val]
+                else:
+                    row[col] = value = TOONParser._parse_value(val)
+                    if len(cache) < cache_size:
+                        cache[val] = value
 
             result.append(row)
             idx += 1
 
-        return key, result
+        return result, idx
+
+    @staticmethod
+    def _parse_list_items(lines: List[str], start_idx: int, base_indent: int) -> tuple:
+        """
+        Parsea los elementos "- " de un array complejo
+
+        El contenido de cada elemento se trata como si el guion fuera
+        indentación: "  - id: 1" es la primera propiedad de un objeto cuyas
+        demás propiedades están alineadas con ella.
+        """
+        result = []
+        idx = start_idx
+
+        while idx < len(lines):
+            line = lines[idx]
+            stripped = line.lstrip()
+            dash_indent = len(line) - len(stripped)
+            if dash_indent <= base_indent:
+                break
+
+            if stripped[0] != '-' or stripped[1:2] not in ('', ' '):
+                idx += 1
+                continue
+
+            content = stripped[1:].lstrip()
+            if not content:
+                result.append(None)
+                idx += 1
+                continue
+
+            # Sustituir "- " por espacios para parsear el elemento en su columna
+            lines[idx] = " " * (len(line) - len(content)) + content
+            value, idx = TOONParser._parse_block(lines, idx, dash_indent)
+            result.append(value)
+
+        return result, idx
 
     @staticmethod
-    def _parse_simple_array(line: str) -> tuple:
+    def _parse_simple_array(values_part: str) -> List[Any]:
         """
-        Parsea un array simple
+        Parsea los valores de un array simple
 
         Ejemplo: tags[3]: developer, python, rust
         """
-        key = line.split('[')[0].strip()
-        values_part = line.split(':', 1)[1].strip()
-        values = [TOONParser._parse_value(v.strip()) for v in values_part.split(',')]
-        return key, values
+        if not values_part:
+            return []
+        return [TOONParser._parse_value(v) for v in split_values(values_part)]
 
     @staticmethod
     def _parse_value(value: str) -> Any:
         """Convierte un valor string a su tipo Python"""
         value = value.strip()
 
+        # String entre comillas (con escapes)
+        if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+            return unquote_string(value)
+
         # Null
         if value == "null":
             return None
@@ -175,15 +268,15 @@ class TOONParser:
             return False
 
         # Number
-        try:
-            if '.' in value:
+        if NUMBER.fullmatch(value):
+            if '.' in value or 'e' in value or 'E' in value:
                 return float(value)
             return int(value)
-        except ValueError:
-            pass
 
-        # String (remover comillas si existen)
-        if value.startswith('"') and value.endswith('"'):
-            return value[1:-1]
+        # Objeto vacío y array en línea: {}, [], [a, b]
+        if value == "{}":
+            return {}
+        if len(value) >= 2 and value[0] == '[' and value[-1] == ']':
+            return TOONParser._parse_simple_array(value[1:-1].strip())
 
         return value
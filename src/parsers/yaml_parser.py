@@ -1,23 +1,110 @@
+from typing import Any, Iterable, Iterator, List, TextIO
+
 import yaml
-from ..models.structure import DocumentStructure
+from ..models.structure import DocumentStructure, StructureNode
+from ..transformers.to_structure import StructureTransformer
+from ..utils.io import open_input
+from ..utils.parallel import ordered_map
 from .json_parser import JSONParser
 
+# Loader en C cuando libyaml está disponible (mismo comportamiento que safe_load)
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class YAMLParser:
-    """Parser para archivos YAML"""
+    """Parser para archivos YAML (incluye streams con varios documentos)"""
 
     @staticmethod
     def parse(content: str) -> DocumentStructure:
-        """Parse YAML string a DocumentStructure"""
-        data = yaml.safe_load(content)
-        # Reutilizamos la lógica de JSON ya que YAML se convierte a dict/list
-        root = JSONParser._analyze_value(data)
-        return DocumentStructure(root=root, format="yaml")
+        """
+        Parse YAML string a DocumentStructure
+
+        Si el contenido tiene varios documentos (separados por ---),
+        la estructura resultante es la unión de todos ellos.
+        """
+        nodes = [JSONParser._analyze_value(data) for data in yaml.load_all(content, Loader=_SafeLoader)]
+        return YAMLParser._merged_structure(nodes)
+
+    @staticmethod
+    def parse_file(filepath: str, workers: int = 1) -> DocumentStructure:
+        """Parse YAML file a DocumentStructure (documentos múltiples unidos)"""
+        return YAMLParser._merged_structure(
+            [structure.root for structure in YAMLParser.parse_documents(filepath, workers)]
+        )
+
+    @staticmethod
+    def parse_documents(filepath: str, workers: int = 1) -> Iterator[DocumentStructure]:
+        """
+        Produce una DocumentStructure por cada documento del stream
+
+        El archivo se lee de forma incremental y se corta en documentos por
+        sus marcadores (---, ...). Con workers > 1 la carga y la inferencia
+        de cada documento se hacen en procesos separados, conservando el orden.
+        """
+        with open_input(filepath) as f:
+            texts = YAMLParser.split_documents(f)
+            for index, root in enumerate(ordered_map(_infer_document, texts, workers)):
+                yield DocumentStructure(root=root, format="yaml", metadata={"document": index})
+
+    @staticmethod
+    def iter_documents(stream: TextIO) -> Iterator[Any]:
+        """Carga los documentos de un stream YAML uno a uno (como safe_load_all)"""
+        return yaml.load_all(stream, Loader=_SafeLoader)
 
     @staticmethod
-    def parse_file(filepath: str) -> DocumentStructure:
-        """Parse YAML file a DocumentStructure"""
-        # utf-8-sig para manejar BOM en Windows
-        with open(filepath, 'r', encoding='utf-8-sig') as f:
-            content = f.read()
-        return YAMLParser.parse(content)
+    def split_documents(lines: Iterable[str]) -> Iterator[str]:
+        """
+        Corta un stream YAML en el texto de cada documento sin parsearlo
+
+        Los marcadores de documento solo pueden aparecer en la columna 0,
+        así que basta con inspeccionar el inicio de cada línea.
+        """
+        buffer: List[str] = []
+        has_content = False
+
+        for line in lines:
+            if line.startswith('---') and (len(line) == 3 or line[3] in ' \t\r\n'):
+                if has_content:
+                    yield ''.join(buffer)
+                    buffer = []
+                buffer.append(line)
+                has_content = True
+            elif line.startswith('...') and (len(line) == 3 or line[3] in ' \t\r\n'):
+                if has_content:
+                    buffer.append(line)
+                    yield ''.join(buffer)
+                buffer = []
+                has_content = False
+            elif line.startswith('%'):
+                # Las directivas pertenecen al documento siguiente
+                if has_content:
+                    yield ''.join(buffer)
+                    buffer = []
+                    has_content = False
+                buffer.append(line)
+            else:
+                buffer.append(line)
+                stripped = line.strip()
+                if stripped and not stripped.startswith('#'):
+                    has_content = True
+
+        if has_content:
+            yield ''.join(buffer)
+
+    @staticmethod
+    def _merged_structure(nodes: List[StructureNode]) -> DocumentStructure:
+        """Une las estructuras de varios documentos en una sola"""
+        if not nodes:
+            return DocumentStructure(root=StructureNode(type="null", nullable=True), format="yaml")
+
+        root = nodes[0]
+        for node in nodes[1:]:
+            root = StructureTransformer.merge_nodes(root, node)
+
+        metadata = {"documents": len(nodes)} if len(nodes) > 1 else {}
+        return DocumentStructure(root=root, format="yaml", metadata=metadata)
+
+
+def _infer_document(text: str) -> StructureNode:
+    """Carga un documento YAML e infiere su estructura (ejecutable en un worker)"""
+    return JSONParser._analyze_value(yaml.load(text, Loader=_SafeLoader))
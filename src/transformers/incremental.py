@@ -0,0 +1,149 @@
+import pickle
+from typing import Any, Dict, List, Optional
+
+from ..models.structure import DocumentStructure
+from ..parsers.json_parser import JSONParser
+from ..utils.quoting import quote_key
+from .to_schema import SchemaTransformer
+from .to_toon import TOONTransformer
+
+# Profundidad máxima que usa JSONParser._analyze_value por defecto
+_MAX_DEPTH = 10
+
+
+class _Entry:
+    """Fragmentos cacheados de una propiedad: valor, TOON, schema e hijos"""
+    __slots__ = ("value", "toon", "schema", "children")
+
+    def __init__(self, value: Any, toon: str, schema: Dict[str, Any], children: Optional[Dict[str, "_Entry"]]):
+        self.value = value
+        self.toon = toon
+        self.schema = schema
+        self.children = children
+
+
+class IncrementalEncoder:
+    """
+    Re-codifica un documento reutilizando los fragmentos que no cambiaron
+
+    Cada llamada a `update` compara el documento nuevo con el anterior por
+    clave y por subárbol (objetos anidados). Solo las propiedades que cambian
+    pasan otra vez por TOONTransformer y SchemaTransformer; el resto se
+    empalma desde la caché. La salida es idéntica a la de
+    TOONTransformer.to_toon y SchemaTransformer.to_json_schema.
+
+    La caché guarda una copia de cada subárbol re-codificado, así que el
+    llamador puede modificar el mismo documento y volver a pasarlo.
+
+    Ejemplo:
+        encoder = IncrementalEncoder()
+        toon, schema = encoder.update(data)
+        print(encoder.changed)  # rutas re-codificadas en la última llamada
+    """
+
+    def __init__(
+            self,
+            indent: int = 2,
+            title: str = "Generated Schema",
+            sparsity: float = TOONTransformer.TABULAR_MAX_SPARSITY,
+    ):
+        self.indent = indent
+        self.title = title
+        self.sparsity = sparsity
+        self.changed: List[str] = []
+        self._root: Optional[_Entry] = None
+
+    def update(self, data: Any) -> tuple:
+        """Retorna (toon, json_schema) del documento, recalculando solo lo que cambió"""
+        self.changed = []
+
+        if type(data) is not dict or not data:
+            # Sin claves que cachear: codificación completa
+            self._root = None
+            self.changed.append("$")
+            structure = DocumentStructure(root=JSONParser._analyze_value(data))
+            toon = TOONTransformer.to_toon(data, self.indent, sparsity=self.sparsity)
+            return toon, SchemaTransformer.to_json_schema(structure, self.title)
+
+        old_children = self._root.children if self._root is not None else {}
+        children = {
+            key: self._encode(key, value, -1, 1, old_children.get(key), key, False)
+            for key, value in data.items()
+        }
+        self._root = _Entry(data, "", {}, children)
+
+        toon = "\n".join(entry.toon for entry in children.values()).lstrip()
+        schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "title": self.title,
+            "type": "object",
+            "properties": {key: entry.schema for key, entry in children.items()},
+        }
+        return toon, schema
+
+    def _encode(
+            self, key: str, value: Any, level: int, depth: int, old: Optional[_Entry], path: str, private: bool
+    ) -> _Entry:
+        """
+        Codifica la propiedad `key` de un objeto (`level` es el nivel TOON
+        que recibe TOONTransformer._property_to_toon, `depth` la profundidad
+        para la inferencia de estructura, `private` indica si `value` ya es
+        una copia propia de la caché)
+        """
+        if old is not None and _same(old.value, value):
+            return old
+
+        if not private:
+            # La caché no puede compartir objetos mutables con el llamador
+            value = _snapshot(value)
+
+        if type(value) is dict and value and depth < _MAX_DEPTH:
+            # Objeto: se recorre por clave para reutilizar los hijos sin cambios
+            old_children = old.children if old is not None and old.children is not None else {}
+            children = {
+                k: self._encode(k, v, level + 1, depth + 1, old_children.get(k), f"{path}.{k}", True)
+                for k, v in value.items()
+            }
+            # Replica TOONTransformer._object_to_toon(value, level + 1, indent, key)
+            spaces = " " * ((level + 2) * self.indent)
+            lines = [f"{quote_key(key)}:"]
+            lines.extend(spaces + entry.toon for entry in children.values())
+            schema = {
+                "type": "object",
+                "properties": {k: entry.schema for k, entry in children.items()},
+            }
+            return _Entry(value, "\n".join(lines), schema, children)
+
+        self.changed.append(path)
+        toon = TOONTransformer._property_to_toon(key, value, level, self.indent, sparsity=self.sparsity)
+        node = JSONParser._analyze_value(value, current_depth=depth)
+        return _Entry(value, toon, SchemaTransformer._node_to_schema(node), None)
+
+
+def _snapshot(value: Any) -> Any:
+    """Copia profunda de un valor (pickle en C es mucho más rápido que copy.deepcopy)"""
+    if type(value) is not dict and type(value) is not list:
+        return value
+    return pickle.loads(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def _same(a: Any, b: Any) -> bool:
+    """
+    Igualdad estricta para decidir si un fragmento cacheado sigue valiendo
+
+    `==` considera iguales 1, 1.0 y True y no mira el orden de las claves,
+    pero su representación TOON es distinta; por eso se comparan también
+    los tipos y el orden (con operaciones en C siempre que se puede).
+    """
+    if type(a) is not type(b) or a != b:
+        return False
+    if type(a) is dict:
+        if list(a) != list(b):
+            return False
+        a, b = list(a.values()), list(b.values())
+    elif type(a) is not list:
+        return True
+
+    if list(map(type, a)) != list(map(type, b)):
+        return False
+    return all(_same(x, y) for x, y in zip(a, b) if type(x) is dict or type(x) is list)
@@ -0,0 +1,286 @@
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TextIO
+
+from pydantic import BaseModel, PrivateAttr
+
+# Clase de cada byte UTF-8: w (palabra), p (puntuación), s (espacio) y c
+# (continuación de un carácter multibyte). Los caracteres no ASCII cuentan
+# como caracteres de palabra.
+_BYTE_CLASSES = bytes.maketrans(
+    bytes(range(256)),
+    bytes(
+        (b"s" if chr(b).isspace() else b"w" if chr(b).isalnum() or b == 0x5F else b"p")[0] if b < 0x80
+        else ord("c") if b < 0xC0 else ord("w")
+        for b in range(256)
+    ),
+)
+
+# Tamaño de los bloques de texto que se cuentan de una vez
+_BLOCK_CHARS = 1 << 20
+
+# Contenedores con al menos tantos elementos se serializan por partes, y
+# los elementos sueltos se agrupan en lotes de _BATCH_ITEMS para json.dumps
+_SPLIT_ITEMS = 64
+_BATCH_ITEMS = 1000
+
+_dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+def _run_counts(text: str) -> List[int]:
+    """
+    [palabras, caracteres de palabra, rachas de puntuación, caracteres de
+    puntuación, saltos de línea] de un texto
+
+    El texto se traduce a su clase por byte y las rachas se cuentan como
+    transiciones entre clases con bytes.count, todo en C y sin crear una
+    lista de coincidencias.
+    """
+    classes = text.encode('utf-8').translate(_BYTE_CLASSES)
+    first = classes[:1]
+    words = classes.count(b"sw") + classes.count(b"pw") + (first == b"w")
+    puncts = classes.count(b"wp") + classes.count(b"sp") + classes.count(b"cp") + (first == b"p")
+    return [words, classes.count(b"w"), puncts, classes.count(b"p"), text.count("\n")]
+
+
+def _tokens(counts: List[int]) -> int:
+    """
+    Aproxima tokenizadores BPE tipo cl100k: las palabras cuentan ~4
+    caracteres por token (al menos uno por palabra), las rachas de
+    puntuación ~2 caracteres por token (`":"`, `},{` se fusionan) y cada
+    salto de línea con su indentación es un token
+    """
+    words, word_chars, puncts, punct_chars, newlines = counts
+    return max(words, -(-word_chars // 4)) + max(puncts, -(-punct_chars // 2)) + newlines
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimación rápida de tokens de LLM para un texto"""
+    return _tokens(_run_counts(text))
+
+
+def _char_class(char: str) -> int:
+    """Clase de un carácter, la misma que _BYTE_CLASSES da a sus bytes"""
+    if not char.isascii():
+        return 1
+    if char.isspace():
+        return 0
+    return 1 if char.isalnum() or char == "_" else 2
+
+
+def _utf8_size(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+class TokenCounter:
+    """
+    Cuenta bytes y tokens estimados de un texto que llega por partes
+
+    Las partes se agrupan en bloques de ~1 MB que se cortan entre dos
+    rachas (nunca dentro de una palabra o de una racha de puntuación), así
+    que el resultado es el mismo que el de estimate_tokens sobre el texto
+    completo sin tenerlo nunca entero en memoria.
+    """
+
+    def __init__(self):
+        self.bytes = 0
+        self._counts = [0, 0, 0, 0, 0]
+        self._pending: List[str] = []
+        self._pending_chars = 0
+
+    def totals(self) -> tuple:
+        """(bytes, tokens estimados) de todo lo recibido hasta ahora"""
+        self._flush(final=True)
+        return self.bytes, _tokens(self._counts)
+
+    def feed(self, text: str) -> None:
+        self.bytes += _utf8_size(text)
+        if len(text) > _BLOCK_CHARS:
+            for i in range(0, len(text), _BLOCK_CHARS):
+                self._append(text[i:i + _BLOCK_CHARS])
+        else:
+            self._append(text)
+
+    def _append(self, text: str) -> None:
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._pending_chars >= _BLOCK_CHARS:
+            self._flush(final=False)
+
+    def _flush(self, final: bool) -> None:
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending = []
+        self._pending_chars = 0
+
+        if not final:
+            # Cortar en el último cambio de clase de carácter; el resto espera
+            cut = len(text) - 1
+            last = _char_class(text[cut])
+            while cut > 0 and _char_class(text[cut - 1]) == last:
+                cut -= 1
+            self._pending.append(text[cut:])
+            self._pending_chars = len(text) - cut
+            text = text[:cut]
+
+        for i, count in enumerate(_run_counts(text)):
+            self._counts[i] += count
+
+
+def minified_json_pieces(value: Any) -> Iterator[str]:
+    """
+    Partes del JSON minificado de `value`, en orden
+
+    Los contenedores grandes o con contenedores dentro se recorren aquí y
+    sus elementos se serializan por lotes con el codificador C, así que
+    nunca se construye la copia JSON completa de un documento grande.
+    """
+    if type(value) is list and value and (len(value) >= _SPLIT_ITEMS or _has_containers(value)):
+        yield from _container_pieces(value, "[", "]", list, _is_large)
+    elif type(value) is dict and value and (len(value) >= _SPLIT_ITEMS or _has_containers(value.values())):
+        # Los valores de un objeto suelen ser estructurales: se recorren también
+        # si tienen contenedores dentro
+        yield from _container_pieces(
+            value.items(), "{", "}", dict,
+            lambda item: _is_large(item[1]) or (type(item[1]) is dict and _has_containers(item[1].values())),
+        )
+    else:
+        yield _dumps(value)
+
+
+def _container_pieces(
+        items: Iterable[Any], opening: str, closing: str, batch_type: type, is_large: Callable[[Any], bool]
+) -> Iterator[str]:
+    separator = opening
+    batch = []
+    for item in items:
+        if is_large(item):
+            if batch:
+                yield separator + _dumps(batch_type(batch))[1:-1]
+                separator = ","
+                batch = []
+            if batch_type is dict:
+                key, item = item
+                # La clave tal como la escribe json (también las que no son str)
+                yield separator + _dumps({key: None})[1:-5]
+            else:
+                yield separator
+            separator = ","
+            yield from minified_json_pieces(item)
+        else:
+            batch.append(item)
+            if len(batch) == _BATCH_ITEMS:
+                yield separator + _dumps(batch_type(batch))[1:-1]
+                separator = ","
+                batch = []
+    if batch:
+        yield separator + _dumps(batch_type(batch))[1:-1]
+    yield closing
+
+
+def _is_large(value: Any) -> bool:
+    return (type(value) is dict or type(value) is list) and len(value) >= _SPLIT_ITEMS
+
+
+def _has_containers(items: Iterable[Any]) -> bool:
+    return any(type(item) is dict or type(item) is list for item in items)
+
+
+class EncodingStats(BaseModel):
+    """Tamaño y tokens estimados de la fuente, del JSON minificado y del TOON"""
+    file: str = ""
+    documents: int = 0
+    source_bytes: int = 0
+    source_tokens: int = 0
+    json_bytes: int = 0
+    json_tokens: int = 0
+    toon_bytes: int = 0
+    toon_tokens: int = 0
+
+    _source: TokenCounter = PrivateAttr(default_factory=TokenCounter)
+    _json: TokenCounter = PrivateAttr(default_factory=TokenCounter)
+    _toon: TokenCounter = PrivateAttr(default_factory=TokenCounter)
+
+    def add_document(self, data: Any, toon_text: str) -> None:
+        """Acumula un documento ya codificado a TOON"""
+        self.documents += 1
+        for piece in minified_json_pieces(data):
+            self._json.feed(piece)
+        self._toon.feed(toon_text)
+
+    def add_source(self, chunk: str) -> None:
+        self._source.feed(chunk)
+
+    def finish(self) -> None:
+        """Vuelca los contadores en los campos del modelo (al terminar la lectura)"""
+        self.source_bytes, self.source_tokens = self._source.totals()
+        self.json_bytes, self.json_tokens = self._json.totals()
+        self.toon_bytes, self.toon_tokens = self._toon.totals()
+
+    @staticmethod
+    def saving(before: int, after: int) -> float:
+        """Porcentaje de reducción de `before` a `after`"""
+        return (1 - after / before) * 100 if before else 0.0
+
+    def to_report(self) -> Dict[str, Any]:
+        """Diccionario exportable, con los porcentajes de ahorro"""
+        report = self.model_dump()
+        report["toon_vs_json_bytes_saving"] = round(self.saving(self.json_bytes, self.toon_bytes), 2)
+        report["toon_vs_json_tokens_saving"] = round(self.saving(self.json_tokens, self.toon_tokens), 2)
+        report["toon_vs_source_tokens_saving"] = round(self.saving(self.source_tokens, self.toon_tokens), 2)
+        return report
+
+    @staticmethod
+    def export(entries: List["EncodingStats"], filepath: str) -> Dict[str, Any]:
+        """
+        Añade entradas a un archivo de estadísticas JSON y recalcula los totales
+
+        Si el archivo ya existe se conservan sus entradas, así que varias
+        ejecuciones (un lote de archivos) acumulan en el mismo reporte.
+        """
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                files = json.load(f).get("files", [])
+        except FileNotFoundError:
+            files = []
+
+        files.extend(entry.to_report() for entry in entries)
+
+        totals = EncodingStats(file="*")
+        for item in files:
+            for field in ("documents", "source_bytes", "source_tokens", "json_bytes",
+                          "json_tokens", "toon_bytes", "toon_tokens"):
+                setattr(totals, field, getattr(totals, field) + item.get(field, 0))
+
+        report = {"files": files, "totals": totals.to_report()}
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+
+class CountingReader:
+    """
+    Envoltura de un stream de texto que cuenta bytes y tokens al leer
+
+    Permite medir la fuente mientras los parsers la consumen en streaming,
+    sin volver a leer el archivo.
+    """
+
+    def __init__(self, stream: TextIO, stats: EncodingStats):
+        self._stream = stream
+        self._stats = stats
+
+    def read(self, size: int = -1) -> str:
+        chunk = self._stream.read(size)
+        self._stats.add_source(chunk)
+        return chunk
+
+    def readline(self, size: int = -1) -> str:
+        line = self._stream.readline(size)
+        self._stats.add_source(line)
+        return line
+
+    def __iter__(self) -> Iterator[str]:
+        for line in self._stream:
+            self._stats.add_source(line)
+            yield line
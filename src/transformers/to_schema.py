@@ -17,7 +17,6 @@ class SchemaTransformer:
         schema = {
             "$schema": "http://json-schema.org/draft-07/schema#",
             "title": title,
-            "type": SchemaTransformer._map_type(structure.root.type)
         }
 
         # Agregar propiedades del nodo raíz
@@ -29,7 +28,8 @@ class SchemaTransformer:
     @staticmethod
     def _node_to_schema(node: StructureNode) -> Dict[str, Any]:
         """Convierte un nodo a JSON Schema"""
-        schema = {
+        # Tipos mezclados: sin restricción de tipo (acepta también null)
+        schema = {} if node.type == "any" else {
             "type": SchemaTransformer._map_type(node.type)
         }
 
@@ -38,7 +38,7 @@ class SchemaTransformer:
             schema["description"] = node.description
 
         # Nullable
-        if node.nullable:
+        if node.nullable and "type" in schema:
             schema["type"] = [schema["type"], "null"]
 
         # Object
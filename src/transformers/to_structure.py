@@ -56,3 +56,51 @@ class StructureTransformer:
             schema["example"] = node.example
 
         return schema
+
+    @staticmethod
+    def merge_nodes(a: StructureNode, b: StructureNode) -> StructureNode:
+        """
+        Une dos estructuras inferidas (por ejemplo, de varios documentos)
+
+        Los objetos se unen por clave, los arrays por su tipo de item,
+        null vuelve nullable al otro tipo e integer + float da float. Dos
+        tipos distintos se amplían a "any" (sin restricción de tipo), de
+        modo que la estructura unida acepta todos los documentos.
+        """
+        if a.type == "null" and b.type != "null":
+            return b.model_copy(update={"nullable": True})
+        if b.type == "null" and a.type != "null":
+            return a.model_copy(update={"nullable": True})
+
+        nullable = a.nullable or b.nullable
+
+        if {a.type, b.type} == {"integer", "float"}:
+            return a.model_copy(update={"type": "float", "nullable": nullable})
+
+        if a.type != b.type or a.type == "any":
+            types = list(dict.fromkeys((a.types or [a.type]) + (b.types or [b.type])))
+            return StructureNode(
+                type="any",
+                types=types,
+                description=f"Mixed types: {', '.join(types)}",
+                example=a.example,
+                nullable=nullable,
+            )
+
+        if a.type == "object":
+            children = dict(a.children or {})
+            for key, child in (b.children or {}).items():
+                children[key] = (
+                    StructureTransformer.merge_nodes(children[key], child)
+                    if key in children else child
+                )
+            return a.model_copy(update={"children": children or None, "nullable": nullable})
+
+        if a.type == "array":
+            if a.items is None or b.items is None:
+                items = a.items or b.items
+            else:
+                items = StructureTransformer.merge_nodes(a.items, b.items)
+            return a.model_copy(update={"items": items, "nullable": nullable})
+
+        return a.model_copy(update={"nullable": nullable})
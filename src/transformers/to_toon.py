@@ -1,4 +1,15 @@
-from typing import Any, List, Dict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+from typing import Any, Callable, List, Dict, Optional
+
+from ..utils.quoting import quote_key, quote_string
+
+# Tipos que pueden ir en una celda de tabla
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+# Celda ausente en una fila de tabla con unión de claves
+_ABSENT = object()
 
 
 class TOONTransformer:
@@ -10,18 +21,91 @@ class TOONTransformer:
     Características:
     1. Arrays con tamaño explícito: users[2]:
     2. Formato tabular para listas de objetos: users[2]{id,name,role}:
+       si a algunos objetos les faltan claves se usa la unión de claves
+       y las celdas ausentes se marcan con MISSING: users[2]{id,email}:
     3. Indentación en lugar de llaves
     4. Sin comillas innecesarias
     """
 
+    # Arrays con menos elementos se codifican siempre en serie
+    PARALLEL_MIN_ITEMS = 2000
+
+    # Marcador de celda ausente en tablas con unión de claves
+    MISSING = "-"
+
+    # Fracción máxima de celdas ausentes para usar el formato tabular
+    TABULAR_MAX_SPARSITY = 0.3
+
+    # Strings distintos cuya representación se cachea por bloque de filas
+    CELL_CACHE_SIZE = 4096
+
     @staticmethod
-    def to_toon(data: Any, indent: int = 2) -> str:
-        """Convierte datos a formato TOON"""
-        result = TOONTransformer._value_to_toon(data, -1, indent)
+    def to_toon(
+            data: Any,
+            indent: int = 2,
+            workers: int = 1,
+            chunk_size: Optional[int] = None,
+            sparsity: float = TABULAR_MAX_SPARSITY,
+            executor: Optional[Executor] = None,
+    ) -> str:
+        """
+        Convierte datos a formato TOON
+
+        `sparsity` es la fracción máxima de celdas ausentes con la que un
+        array de objetos todavía se escribe como tabla (0 exige objetos
+        con las mismas claves).
+
+        Con workers > 1 los arrays grandes (tablas y listas de objetos) se
+        dividen en bloques de filas que se formatean en un pool de procesos
+        y se concatenan en orden; la salida es idéntica a la serial. Se puede
+        pasar un `executor` ya creado para reutilizarlo entre llamadas.
+
+        `indent` debe ser al menos 2: en los elementos "- " de un array las
+        propiedades de un objeto se alinean con la que sigue al guion.
+        """
+        if indent < 2:
+            raise ValueError("indent must be at least 2")
+
+        if executor is None and workers <= 1:
+            result = TOONTransformer._value_to_toon(data, -1, indent, sparsity=sparsity)
+            return result.lstrip()
+
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return TOONTransformer.to_toon(data, indent, workers, chunk_size, sparsity, executor)
+
+        pool = partial(TOONTransformer._map_chunks, executor, max(workers, 1), chunk_size)
+        result = TOONTransformer._value_to_toon(data, -1, indent, pool=pool, sparsity=sparsity)
         return result.lstrip()
 
     @staticmethod
-    def _value_to_toon(value: Any, level: int, indent: int, key: str = None) -> str:
+    def _map_chunks(
+            executor: Executor,
+            workers: int,
+            chunk_size: Optional[int],
+            func: Callable[[List], List[str]],
+            arr: List,
+    ) -> List[str]:
+        """Aplica func (lista -> líneas) por bloques en el pool y une las líneas en orden"""
+        if len(arr) < TOONTransformer.PARALLEL_MIN_ITEMS:
+            return func(arr)
+
+        size = chunk_size or max(500, -(-len(arr) // (workers * 4)))
+        chunks = [arr[i:i + size] for i in range(0, len(arr), size)]
+        lines = []
+        for chunk_lines in executor.map(func, chunks):
+            lines.extend(chunk_lines)
+        return lines
+
+    @staticmethod
+    def _value_to_toon(
+            value: Any,
+            level: int,
+            indent: int,
+            key: str = None,
+            pool: Callable = None,
+            sparsity: float = TABULAR_MAX_SPARSITY,
+    ) -> str:
         """Convierte un valor a formato TOON"""
         spaces = " " * (level * indent) if level >= 0 else ""
 
@@ -37,131 +121,251 @@ class TOONTransformer:
         elif isinstance(value, (int, float)):
             return str(value)
 
-        # String
+        # String (comillas y escapes solo si hacen falta)
         elif isinstance(value, str):
-            # Solo usar comillas si contiene espacios, comas o caracteres especiales
-            if any(c in value for c in " ,{}[]:\n\t"):
-                return f'"{value}"'
-            return value
+            return quote_string(value)
 
         # Array
         elif isinstance(value, list):
-            return TOONTransformer._array_to_toon(value, level, indent, key)
+            return TOONTransformer._array_to_toon(value, level, indent, key, pool, sparsity)
 
         # Object
         elif isinstance(value, dict):
-            return TOONTransformer._object_to_toon(value, level, indent, key)
+            return TOONTransformer._object_to_toon(value, level, indent, key, pool, sparsity)
 
         else:
             return str(value)
 
     @staticmethod
-    def _array_to_toon(arr: List, level: int, indent: int, key: str = None) -> str:
+    def _array_to_toon(
+            arr: List,
+            level: int,
+            indent: int,
+            key: str = None,
+            pool: Callable = None,
+            sparsity: float = TABULAR_MAX_SPARSITY,
+    ) -> str:
         """Convierte un array a formato TOON"""
         if not arr:
-            return "[]" if key is None else f"{key}[0]:"
+            return "[]" if key is None else f"{quote_key(key)}[0]:"
 
-        spaces = " " * (level * indent) if level >= 0 else ""
         size = len(arr)
 
-        # Detectar si es un array de objetos uniformes (formato tabular)
-        if all(isinstance(item, dict) for item in arr) and len(arr) > 0:
-            # Verificar que todos tengan las mismas claves
-            first_keys = set(arr[0].keys())
-            if all(set(item.keys()) == first_keys for item in arr):
-                return TOONTransformer._array_tabular(arr, level, indent, key)
+        # Detectar si es un array de objetos (casi) uniformes (formato tabular)
+        if all(isinstance(item, dict) for item in arr):
+            columns = TOONTransformer._tabular_columns(arr, sparsity)
+            if columns is not None:
+                return TOONTransformer._array_tabular(arr, level, indent, key, pool, *columns)
 
         # Array de primitivos (en una línea si son simples)
         if all(isinstance(x, (str, int, float, bool, type(None))) for x in arr):
             items = [TOONTransformer._value_to_toon(x, -1, indent) for x in arr]
 
             # Si el key existe, formato: key[N]: val1, val2, val3
-            if key:
+            if key is not None:
                 items_str = ", ".join(items)
-                return f"{key}[{size}]: {items_str}"
+                return f"{quote_key(key)}[{size}]: {items_str}"
             else:
                 return f"[{', '.join(items)}]"
 
-        # Array complejo (cada elemento en su línea)
+        # Array complejo (cada elemento en su línea, con "- ")
+        lines = [f"{quote_key(key)}[{size}]:" if key is not None else f"[{size}]:"]
+
+        format_items = partial(TOONTransformer._format_items, level=level, indent=indent, sparsity=sparsity)
+        lines.extend(pool(format_items, arr) if pool else format_items(arr))
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_items(arr: List, level: int, indent: int, sparsity: float = TABULAR_MAX_SPARSITY) -> List[str]:
+        """
+        Formatea los elementos de un array complejo, uno por línea
+
+        El guion va un nivel por debajo de la cabecera y el contenido del
+        elemento empieza en el nivel siguiente, así que la primera propiedad
+        de un objeto queda alineada con las demás:
+
+        items[2]:
+          - id: 1
+            tags[2]: a, b
+          - 42
+        """
+        item_level = max(level, 0) + 1
+        prefix = " " * (item_level * indent) + "-" + " " * (indent - 1)
+        column = len(prefix)
+
         lines = []
-        if key:
-            lines.append(f"{key}[{size}]:")
-
-        for i, item in enumerate(arr):
-            item_str = TOONTransformer._value_to_toon(item, level + 1, indent)
-            if "\n" in item_str:
-                # Multilínea
-                lines.append(f"{spaces}{' ' * indent}- {item_str}")
+        for item in arr:
+            if isinstance(item, dict) and item:
+                # Las propiedades empiezan en `column`: la primera se pega al guion
+                text = TOONTransformer._object_to_toon(item, item_level, indent, sparsity=sparsity)
+                lines.append(prefix + text[column:])
+            elif isinstance(item, list):
+                lines.append(prefix + TOONTransformer._array_to_toon(item, item_level, indent, sparsity=sparsity))
             else:
-                lines.append(f"{spaces}{' ' * indent}- {item_str}")
+                lines.append(prefix + TOONTransformer._value_to_toon(item, item_level, indent))
+        return lines
 
-        return "\n".join(lines)
+    @staticmethod
+    def _tabular_columns(arr: List[Dict], sparsity: float) -> Optional[tuple]:
+        """
+        Calcula en una pasada la unión de claves de un array de objetos
+
+        Retorna (columnas, hay_ausentes) si el array puede escribirse como
+        tabla: todos los valores son primitivos y la fracción de celdas
+        ausentes no supera `sparsity`. Retorna None en caso contrario.
+        """
+        first_keys = arr[0].keys()
+        union = dict.fromkeys(first_keys)
+        cells = 0
+
+        for item in arr:
+            keys = item.keys()
+            if keys != first_keys:
+                union.update(dict.fromkeys(keys))
+            if not _PRIMITIVE_TYPES.issuperset(map(type, item.values())):
+                return None
+            cells += len(item)
+
+        if not union:
+            return None
+
+        total = len(arr) * len(union)
+        if total - cells > sparsity * total:
+            return None
+        return list(union), cells < total
 
     @staticmethod
-    def _array_tabular(arr: List[Dict], level: int, indent: int, key: str = None) -> str:
+    def _array_tabular(
+            arr: List[Dict],
+            level: int,
+            indent: int,
+            key: str = None,
+            pool: Callable = None,
+            keys: Optional[List[str]] = None,
+            sparse: bool = False,
+    ) -> str:
         """
-        Convierte un array de objetos uniformes a formato tabular TOON
+        Convierte un array de objetos a formato tabular TOON
+
+        Las columnas son la unión de claves; las celdas de claves ausentes
+        en un objeto se escriben como MISSING.
 
         Ejemplo:
-        users[2]{id,name,role}:
+        users[3]{id,name,role}:
         1,Alice,admin
-        2,Bob,user
+        2,Bob,-
+        3,Carol,user
         """
         if not arr:
             return ""
 
-        spaces = " " * (level * indent) if level >= 0 else ""
         size = len(arr)
-        keys = list(arr[0].keys())
-        keys_str = ",".join(keys)
+        if keys is None:
+            keys = list(arr[0].keys())
+        keys_str = ",".join([quote_key(k) for k in keys])
 
         lines = []
 
         # Header: users[2]{id,name,role}:
-        if key:
-            lines.append(f"{key}[{size}]{{{keys_str}}}:")
+        if key is not None:
+            lines.append(f"{quote_key(key)}[{size}]{{{keys_str}}}:")
         else:
             lines.append(f"[{size}]{{{keys_str}}}:")
 
         # Rows: valores separados por comas
-        for item in arr:
-            values = [TOONTransformer._format_simple_value(item.get(k)) for k in keys]
-            row_spaces = " " * ((level + 1) * indent) if level >= 0 else " " * indent
-            lines.append(f"{row_spaces}{','.join(values)}")
+        row_spaces = " " * ((level + 1) * indent) if level >= 0 else " " * indent
+        format_rows = partial(TOONTransformer._format_rows, keys=keys, row_spaces=row_spaces, sparse=sparse)
+        lines.extend(pool(format_rows, arr) if pool else format_rows(arr))
 
         return "\n".join(lines)
 
     @staticmethod
-    def _object_to_toon(obj: Dict, level: int, indent: int, key: str = None) -> str:
+    def _format_rows(arr: List[Dict], keys: List[str], row_spaces: str, sparse: bool = False) -> List[str]:
+        """
+        Formatea filas tabulares (ejecutable en un worker)
+
+        Las columnas suelen repetir valores (estados, roles, países); la
+        representación de cada string distinto se calcula una vez por bloque
+        de filas (hasta CELL_CACHE_SIZE strings) y se reutiliza.
+        """
+        cache: Dict[Any, str] = {_ABSENT: TOONTransformer.MISSING}
+        cached = cache.get
+        format_value = TOONTransformer._format_simple_value
+        cache_size = TOONTransformer.CELL_CACHE_SIZE
+
+        def format_cell(value: Any) -> str:
+            if type(value) is not str:
+                return format_value(value)
+            text = quote_string(value)
+            if len(cache) < cache_size:
+                cache[value] = text
+            return text
+
+        if sparse:
+            def row_values(item):
+                return [item.get(k, _ABSENT) for k in keys]
+        elif len(keys) == 1:
+            def row_values(item, key=keys[0]):
+                return (item[key],)
+        else:
+            row_values = itemgetter(*keys)
+
+        # Solo hay strings (y el marcador de ausencia) en la caché: un entero o
+        # booleano nunca coincide con una clave y se formatea directamente
+        return [
+            row_spaces + ",".join([cached(value) or format_cell(value) for value in row_values(item)])
+            for item in arr
+        ]
+
+    @staticmethod
+    def _object_to_toon(
+            obj: Dict,
+            level: int,
+            indent: int,
+            key: str = None,
+            pool: Callable = None,
+            sparsity: float = TABULAR_MAX_SPARSITY,
+    ) -> str:
         """Convierte un objeto a formato TOON con indentación"""
         if not obj:
-            return "{}"
+            return "{}" if key is None else f"{quote_key(key)}: {{}}"
 
         spaces = " " * ((level + 1) * indent) if level >= 0 else ""
         lines = []
 
         # Si hay un key padre, agregarlo
-        if key:
-            lines.append(f"{key}:")
+        if key is not None:
+            lines.append(f"{quote_key(key)}:")
 
         # Cada propiedad en su línea
         for k, v in obj.items():
-            if isinstance(v, dict):
-                # Objeto anidado
-                nested = TOONTransformer._object_to_toon(v, level + 1, indent, k)
-                lines.append(f"{spaces}{nested}")
+            lines.append(f"{spaces}{TOONTransformer._property_to_toon(k, v, level, indent, pool, sparsity)}")
 
-            elif isinstance(v, list):
-                # Array
-                arr_str = TOONTransformer._array_to_toon(v, level + 1, indent, k)
-                lines.append(f"{spaces}{arr_str}")
+        return "\n".join(lines)
 
-            else:
-                # Valor simple
-                val_str = TOONTransformer._value_to_toon(v, -1, indent)
-                lines.append(f"{spaces}{k}: {val_str}")
+    @staticmethod
+    def _property_to_toon(
+            k: str,
+            v: Any,
+            level: int,
+            indent: int,
+            pool: Callable = None,
+            sparsity: float = TABULAR_MAX_SPARSITY,
+    ) -> str:
+        """Formatea una propiedad de un objeto de nivel `level`, sin la indentación inicial"""
+        if isinstance(v, dict):
+            # Objeto anidado
+            return TOONTransformer._object_to_toon(v, level + 1, indent, k, pool, sparsity)
+
+        elif isinstance(v, list):
+            # Array
+            return TOONTransformer._array_to_toon(v, level + 1, indent, k, pool, sparsity)
 
-        return "\n".join(lines)
+        else:
+            # Valor simple
+            val_str = TOONTransformer._value_to_toon(v, -1, indent)
+            return f"{quote_key(k)}: {val_str}"
 
     @staticmethod
     def _format_simple_value(value: Any) -> str:
@@ -173,9 +377,8 @@ class TOONTransformer:
         elif isinstance(value, (int, float)):
             return str(value)
         elif isinstance(value, str):
-            # En formato tabular, siempre usar comillas si hay espacios o comas
-            if " " in value or "," in value:
-                return f'"{value}"'
-            return value
+            # Misma regla que _value_to_toon: comillas para separadores, "",
+            # el marcador de celda ausente y strings que parecen otro valor
+            return quote_string(value)
         else:
             return str(value)
@@ -0,0 +1,222 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+import re
+import sys
+from pathlib import PurePath
+from typing import IO, AnyStr, Optional
+
+# "-" representa stdin al leer y stdout al escribir
+STDIO = "-"
+
+FORMAT_SUFFIXES = {
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toon": "toon",
+}
+
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "lzma",
+    ".lzma": "lzma",
+}
+
+_MAGIC_BYTES = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "lzma"),
+)
+
+_OPENERS = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "lzma": lzma.open,
+}
+
+_FILE_WRAPPERS = {
+    "gzip": lambda f: gzip.GzipFile(fileobj=f, mode="rb"),
+    "bz2": bz2.BZ2File,
+    "lzma": lzma.LZMAFile,
+}
+
+# Bytes (o caracteres) que se inspeccionan para adivinar el formato
+SNIFF_SIZE = 4096
+
+# Cabecera de array TOON: key[N]: o key[N]{cols}:
+_TOON_HEADER = re.compile(r'^[^\s:#"\[]*\[\d+\](\{[^}]*\})?:')
+
+# stdin solo puede leerse una vez: se comparte el stream (ya descomprimido)
+# para que la detección de formato no consuma bytes del parser.
+_stdin_stream: Optional[IO[bytes]] = None
+
+
+def split_suffix(path: str) -> tuple:
+    """
+    Retorna (sufijo de formato, compresión) mirando a través de la compresión
+
+    Ejemplo: "data.jsonl.xz" -> (".jsonl", "lzma")
+    """
+    suffixes = [s.lower() for s in PurePath(path).suffixes]
+    compression = None
+    if suffixes and suffixes[-1] in COMPRESSION_SUFFIXES:
+        compression = COMPRESSION_SUFFIXES[suffixes.pop()]
+    return (suffixes[-1] if suffixes else ""), compression
+
+
+def open_input(path: str, binary: bool = False) -> IO:
+    """
+    Abre un archivo (o stdin con "-") descomprimiendo de forma transparente
+
+    La compresión se detecta por magic bytes, no por extensión, y se
+    descomprime en streaming: nada se escribe en disco. En modo texto se
+    decodifica como utf-8-sig para manejar BOM.
+    """
+    if path == STDIO:
+        stream = _stdin()
+    else:
+        with open(path, 'rb') as probe:
+            compression = _sniff_compression(probe.peek(8))
+        stream = _OPENERS[compression](path, 'rb') if compression else open(path, 'rb')
+
+    if binary:
+        return stream
+    return io.TextIOWrapper(stream, encoding='utf-8-sig')
+
+
+def open_output(path: str) -> IO[str]:
+    """Abre un archivo de salida en modo texto, comprimiendo según la extensión ("-" es stdout)"""
+    if path == STDIO:
+        return io.TextIOWrapper(open(sys.stdout.fileno(), 'wb', closefd=False), encoding='utf-8')
+
+    _, compression = split_suffix(path)
+    if compression:
+        return _OPENERS[compression](path, 'wt', encoding='utf-8')
+    return open(path, 'w', encoding='utf-8')
+
+
+def detect_format(path: str) -> Optional[str]:
+    """
+    Detecta el formato de datos: json, jsonl, yaml o toon
+
+    Usa la extensión (ignorando la de compresión) y, si no basta, inspecciona
+    el inicio del contenido ya descomprimido. Retorna None si no se reconoce.
+    """
+    suffix, _ = split_suffix(path)
+    if suffix in FORMAT_SUFFIXES:
+        return FORMAT_SUFFIXES[suffix]
+
+    stream = open_input(path, binary=True)
+    try:
+        return sniff_format(stream.peek(SNIFF_SIZE))
+    finally:
+        if path != STDIO:
+            stream.close()
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """Adivina el formato a partir de los primeros bytes del contenido"""
+    text = head.decode('utf-8', errors='ignore').lstrip('\ufeff')
+    lines = [
+        line for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith('#')
+    ]
+    if not lines:
+        return None
+
+    first = lines[0].strip()
+    if first.startswith(('{', '[')):
+        # JSON Lines: la primera línea es un valor completo y le sigue otro
+        if len(lines) > 1 and lines[1].lstrip().startswith(('{', '[')):
+            try:
+                json.loads(first)
+                return "jsonl"
+            except ValueError:
+                pass
+        return "json"
+
+    if any(_TOON_HEADER.match(line.strip()) for line in lines[:50]):
+        return "toon"
+    return "yaml"
+
+
+def sniff_stream(stream: IO) -> tuple:
+    """
+    Detecta el formato de un archivo ya abierto y retorna (formato, stream)
+
+    Usa el nombre del archivo si tiene extensión conocida; si no, inspecciona
+    el inicio del contenido con peek() o, en streams sin peek (modo texto,
+    StringIO, BytesIO...), leyendo una cabecera acotada que se vuelve a
+    poner delante del resto. El stream retornado es el que debe leerse.
+    """
+    name = getattr(stream, "name", None)
+    if isinstance(name, str):
+        suffix, _ = split_suffix(name)
+        if suffix in FORMAT_SUFFIXES:
+            return FORMAT_SUFFIXES[suffix], stream
+
+    peek = getattr(stream, "peek", None)
+    if peek is not None:
+        return sniff_format(peek(SNIFF_SIZE)), stream
+
+    head = stream.read(SNIFF_SIZE)
+    sample = head.encode('utf-8') if isinstance(head, str) else head
+    return sniff_format(sample), PrefixedReader(head, stream)
+
+
+class PrefixedReader:
+    """Stream de lectura que entrega `head` y después el resto de `stream`"""
+
+    def __init__(self, head: AnyStr, stream: IO[AnyStr]):
+        self._head = head
+        self._stream = stream
+        self.name = getattr(stream, "name", None)
+
+    def read(self, size: Optional[int] = -1) -> AnyStr:
+        head = self._head
+        if not head:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            self._head = head[:0]
+            return head + self._stream.read()
+        # Lectura corta permitida: primero se agota la cabecera
+        self._head = head[size:]
+        return head[:size]
+
+    def readline(self, size: Optional[int] = -1) -> AnyStr:
+        head = self._head
+        if not head:
+            return self._stream.readline(size)
+        end = head.find(b"\n" if isinstance(head, bytes) else "\n") + 1
+        if end:
+            self._head = head[end:]
+            return head[:end]
+        self._head = head[:0]
+        return head + self._stream.readline()
+
+    def __iter__(self):
+        return iter(self.readline, self._head[:0])
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+def _sniff_compression(head: bytes) -> Optional[str]:
+    for magic, compression in _MAGIC_BYTES:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _stdin() -> IO[bytes]:
+    global _stdin_stream
+    if _stdin_stream is None:
+        raw = sys.stdin.buffer
+        compression = _sniff_compression(raw.peek(8))
+        _stdin_stream = _FILE_WRAPPERS[compression](raw) if compression else raw
+    return _stdin_stream
@@ -0,0 +1,51 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Agrupa un iterable en listas de tamaño `size` (la última puede ser menor)"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ordered_map(
+        func: Callable[[Any], Any],
+        iterable: Iterable[Any],
+        workers: int = 1,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: tuple = (),
+        max_pending: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    Aplica `func` a cada elemento en un pool de procesos preservando el orden
+
+    Consume el iterable de forma perezosa: como máximo `max_pending` tareas
+    quedan en vuelo, así que la memoria no crece con el tamaño de la entrada.
+    Con workers <= 1 se ejecuta en el proceso actual, sin pool.
+    """
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in iterable:
+            yield func(item)
+        return
+
+    limit = max_pending or workers * 2
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    try:
+        pending = deque()
+        for item in iterable:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # Si el consumidor corta antes (early-exit), no esperar trabajo pendiente
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,98 @@
+import re
+from functools import lru_cache
+from typing import Any, List
+
+# Literal numérico de TOON (el mismo que producen str(int) y str(float))
+NUMBER = re.compile(r'-?[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?')
+
+# Un string va entre comillas si contiene espacios, separadores o caracteres
+# que el parser interpreta, si empieza por '#' (comentario) o si sin comillas
+# se leería como otro valor: vacío, MISSING ("-"), null/true/false o número.
+_SPECIAL_CHARS = re.compile(r'[\s,{}\[\]:"\\]')
+_RESERVED = frozenset({"", "-", "null", "true", "false"})
+_NUMBER_START = frozenset("-0123456789")
+
+# Las claves admiten espacios internos (como hasta ahora), pero van entre
+# comillas si contienen separadores, están vacías o empiezan por '#' o '-'
+_KEY_NEEDS_QUOTES = re.compile(r'[:,{}\[\]"\\\n\r\t]|\A[\s#-]|\s\Z|\A\Z')
+
+_NEEDS_ESCAPE = re.compile(r'["\\\n\r\t]')
+
+_ESCAPE_SEQUENCE = re.compile(r'\\(.)', re.DOTALL)
+_UNESCAPES = {'\\': '\\', '"': '"', 'n': '\n', 'r': '\r', 't': '\t'}
+
+# Celdas de una lista separada por comas: string entre comillas o texto hasta la coma
+_CELLS = re.compile(r'(?:^|,)\s*("(?:[^"\\]|\\.)*"(?=\s*(?:,|$))|[^,]*)', re.DOTALL)
+
+
+def quote_string(value: str) -> str:
+    """
+    Formatea un string como valor TOON, con comillas solo si hace falta
+
+    Dentro de las comillas se escapan ", \\, saltos de línea, retornos y
+    tabuladores, así que el valor siempre ocupa una línea y una celda.
+    """
+    if value.isalnum() or _SPECIAL_CHARS.search(value) is None:
+        if value in _RESERVED:
+            return f'"{value}"'
+        first = value[0]
+        if first == '#' or (first in _NUMBER_START and NUMBER.fullmatch(value)):
+            return f'"{value}"'
+        return value
+    return _quoted(value)
+
+
+def _quoted(value: str) -> str:
+    """Escapa un string y lo envuelve en comillas"""
+    if _NEEDS_ESCAPE.search(value) is not None:
+        # Cadena de str.replace: en CPython es varias veces más rápida que
+        # str.translate con una tabla de strings
+        value = (
+            value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+        )
+    return f'"{value}"'
+
+
+@lru_cache(maxsize=4096, typed=True)
+def quote_key(key: Any) -> str:
+    """
+    Formatea una clave de objeto o una columna de tabla TOON
+
+    Las claves que no son str (YAML produce enteros y booleanos, p. ej.
+    `200: ok`) se escriben con str(). Las claves se repiten mucho entre
+    objetos hermanos, así que la decisión se cachea (por tipo, para que
+    1 y True no compartan entrada).
+    """
+    if type(key) is not str:
+        key = str(key)
+    if _KEY_NEEDS_QUOTES.search(key) is None:
+        return key
+    return _quoted(key)
+
+
+def unquote_key(token: str) -> str:
+    """Inverso de quote_key"""
+    if len(token) >= 2 and token[0] == '"' and token[-1] == '"':
+        return unquote_string(token)
+    return token
+
+
+def unquote_string(token: str) -> str:
+    """Inverso de quote_string para un valor entre comillas (incluidas)"""
+    inner = token[1:-1]
+    if '\\' not in inner:
+        return inner
+    return _ESCAPE_SEQUENCE.sub(lambda m: _UNESCAPES.get(m.group(1), m.group(0)), inner)
+
+
+def split_values(text: str) -> List[str]:
+    """
+    Divide una fila o lista TOON por comas respetando los strings entre comillas
+
+    Las celdas se retornan sin los espacios de alrededor y con sus comillas.
+    """
+    if '"' not in text:
+        return [value.strip() for value in text.split(',')]
+
+    return [value.strip() for value in _CELLS.findall(text)]
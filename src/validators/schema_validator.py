@@ -0,0 +1,675 @@
+import json
+import re
+import time
+from urllib.parse import unquote
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from ..models.structure import DocumentStructure
+from ..transformers.to_schema import SchemaTransformer
+from ..utils.io import detect_format, open_input
+from ..utils.parallel import chunked, ordered_map
+
+
+class ValidationIssue(NamedTuple):
+    """Error de validación: ruta dentro del registro y mensaje"""
+    path: Tuple[Any, ...]
+    message: str
+
+    def format_path(self) -> str:
+        """Ruta en notación JSON Pointer simplificada ($.a[0].b)"""
+        parts = ["$"]
+        for part in self.path:
+            parts.append(f"[{part}]" if isinstance(part, int) else f".{part}")
+        return "".join(parts)
+
+
+class RecordResult(NamedTuple):
+    """Resultado de validar un registro inválido"""
+    # validate_file: número de línea en JSON Lines y número de documento
+    # (desde 1) en el resto de formatos; iter_invalid: posición en el iterable
+    index: int
+    issues: List[ValidationIssue]
+
+
+class ValidationReport(BaseModel):
+    """
+    Resumen de una validación por lotes
+
+    `invalid` cuenta todos los registros inválidos, pero `results` guarda
+    solo los primeros (ver `max_results` en validate_file) para que la
+    memoria no crezca con el tamaño de la entrada.
+    """
+    records: int = 0
+    invalid: int = 0
+    elapsed: float = 0.0
+    stopped_early: bool = False
+    location: Literal["line", "document"] = "document"  # Qué numera RecordResult.index
+    results: List[Any] = Field(default_factory=list)
+
+    @property
+    def valid(self) -> int:
+        return self.records - self.invalid
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# Un validador compilado recibe un valor y retorna None si es válido,
+# o una lista de ValidationIssue con rutas relativas al valor.
+Check = Callable[[Any], Optional[List[ValidationIssue]]]
+
+# Keywords de validación que el compilador no implementa: un schema que los
+# usa se rechaza en lugar de aceptar cualquier valor en silencio
+_UNSUPPORTED_KEYWORDS = frozenset({
+    "if", "then", "else", "patternProperties", "dependencies", "dependentRequired",
+    "dependentSchemas", "propertyNames", "minProperties", "maxProperties", "contains",
+    "minContains", "maxContains", "uniqueItems", "multipleOf", "additionalItems",
+    "prefixItems", "unevaluatedProperties", "unevaluatedItems", "$dynamicRef", "$recursiveRef",
+})
+
+_PY_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+    "array": (list,),
+    "object": (dict,),
+}
+
+
+class SchemaCompiler:
+    """
+    Compila un JSON Schema a un árbol de closures especializadas
+
+    El schema se interpreta una sola vez; cada keyword se traduce a una
+    función pequeña que solo hace el trabajo que ese nodo necesita.
+    Soporta el subconjunto que genera SchemaTransformer más los keywords
+    de validación habituales (enum, const, rangos, longitudes, pattern,
+    additionalProperties, allOf/anyOf/oneOf/not y $ref locales). Los
+    keywords de validación no soportados producen ValueError; las
+    anotaciones (title, description, format, default...) se ignoran.
+    """
+
+    @staticmethod
+    def compile(schema: Any, fail_fast: bool = False, refs: Optional["_References"] = None) -> Check:
+        """
+        Compila un schema (dict o booleano) a una función de validación
+
+        `refs` resuelve los $ref contra el schema raíz; se crea al compilar
+        la raíz y se comparte con todos los subschemas.
+        """
+        if refs is None:
+            refs = _References(schema)
+        if schema is True or schema == {}:
+            return SchemaCompiler._accept
+        if schema is False:
+            return lambda value: [ValidationIssue((), "no value is allowed here")]
+        if not isinstance(schema, dict):
+            raise ValueError(f"Invalid schema node: {schema!r}")
+
+        unsupported = set(_UNSUPPORTED_KEYWORDS.intersection(schema))
+        if isinstance(schema.get("items"), list):
+            unsupported.add("items (array form)")
+        if unsupported:
+            raise ValueError(f"Unsupported schema keyword(s): {', '.join(sorted(unsupported))}")
+
+        checks: List[Check] = []
+
+        if "$ref" in schema:
+            checks.append(refs.compile(schema["$ref"], fail_fast))
+        if "type" in schema:
+            checks.append(SchemaCompiler._compile_type(schema["type"]))
+        if "enum" in schema:
+            checks.append(SchemaCompiler._compile_enum(schema["enum"]))
+        if "const" in schema:
+            checks.append(SchemaCompiler._compile_enum([schema["const"]]))
+
+        checks.extend(SchemaCompiler._compile_numeric(schema))
+        checks.extend(SchemaCompiler._compile_string(schema))
+
+        if any(k in schema for k in ("properties", "required", "additionalProperties")):
+            checks.append(SchemaCompiler._compile_object(schema, fail_fast, refs))
+        if any(k in schema for k in ("items", "minItems", "maxItems")):
+            checks.append(SchemaCompiler._compile_array(schema, fail_fast, refs))
+
+        if "allOf" in schema:
+            checks.extend(SchemaCompiler.compile(sub, fail_fast, refs) for sub in schema["allOf"])
+        if "anyOf" in schema:
+            checks.append(SchemaCompiler._compile_any_of(schema["anyOf"], refs))
+        if "oneOf" in schema:
+            checks.append(SchemaCompiler._compile_one_of(schema["oneOf"], refs))
+        if "not" in schema:
+            checks.append(SchemaCompiler._compile_not(schema["not"], refs))
+
+        return SchemaCompiler._combine(checks, fail_fast)
+
+    @staticmethod
+    def _accept(value: Any) -> None:
+        return None
+
+    @staticmethod
+    def _combine(checks: List[Check], fail_fast: bool) -> Check:
+        """Une varias verificaciones en una sola closure"""
+        if not checks:
+            return SchemaCompiler._accept
+        if len(checks) == 1:
+            return checks[0]
+
+        checks = tuple(checks)
+
+        def check_all(value):
+            errors = None
+            for check in checks:
+                issues = check(value)
+                if issues:
+                    if fail_fast:
+                        return issues
+                    if errors is None:
+                        errors = issues
+                    else:
+                        errors.extend(issues)
+            return errors
+
+        return check_all
+
+    @staticmethod
+    def _compile_type(type_spec: Any) -> Check:
+        """Verificación de tipo usando comparación exacta de type()"""
+        names = [type_spec] if isinstance(type_spec, str) else list(dict.fromkeys(type_spec))
+        allowed = set()
+        for name in names:
+            if name not in _PY_TYPES:
+                raise ValueError(f"Unknown schema type: {name!r}")
+            allowed.update(_PY_TYPES[name])
+        allowed = frozenset(allowed)
+        integral_floats = "integer" in names and float not in allowed
+        expected = " or ".join(names)
+
+        if len(allowed) == 1 and not integral_floats:
+            (only,) = allowed
+
+            def check_single_type(value):
+                if type(value) is not only:
+                    return [ValidationIssue((), f"expected {expected}, got {_json_type(value)}")]
+                return None
+
+            return check_single_type
+
+        def check_type(value):
+            value_type = type(value)
+            if value_type in allowed:
+                return None
+            if integral_floats and value_type is float and value.is_integer():
+                return None
+            return [ValidationIssue((), f"expected {expected}, got {_json_type(value)}")]
+
+        return check_type
+
+    @staticmethod
+    def _compile_enum(options: List[Any]) -> Check:
+        """enum/const; usa un set cuando todas las opciones son hashables"""
+        # Igualdad JSON: 1 y 1.0 son el mismo número (como para "type": "integer"),
+        # pero True no coincide con 1
+        try:
+            lookup = frozenset(_enum_key(o) for o in options)
+        except TypeError:
+            lookup = None
+
+        def check_enum(value):
+            if lookup is not None:
+                try:
+                    if _enum_key(value) in lookup:
+                        return None
+                except TypeError:
+                    pass
+            elif any(_json_equal(value, o) for o in options):
+                return None
+            return [ValidationIssue((), f"value {value!r} is not one of {options!r}")]
+
+        return check_enum
+
+    @staticmethod
+    def _compile_numeric(schema: Dict[str, Any]) -> List[Check]:
+        checks = []
+        bounds = [
+            ("minimum", lambda v, b: v >= b, "less than minimum"),
+            ("maximum", lambda v, b: v <= b, "greater than maximum"),
+            ("exclusiveMinimum", lambda v, b: v > b, "not greater than exclusiveMinimum"),
+            ("exclusiveMaximum", lambda v, b: v < b, "not less than exclusiveMaximum"),
+        ]
+        for keyword, passes, text in bounds:
+            if keyword not in schema or isinstance(schema[keyword], bool):
+                continue
+
+            def check_bound(value, bound=schema[keyword], passes=passes, text=text):
+                value_type = type(value)
+                if (value_type is int or value_type is float) and not passes(value, bound):
+                    return [ValidationIssue((), f"{value} is {text} {bound}")]
+                return None
+
+            checks.append(check_bound)
+        return checks
+
+    @staticmethod
+    def _compile_string(schema: Dict[str, Any]) -> List[Check]:
+        checks = []
+        min_length = schema.get("minLength")
+        max_length = schema.get("maxLength")
+        if min_length is not None or max_length is not None:
+            low = min_length or 0
+            high = max_length if max_length is not None else float("inf")
+
+            def check_length(value):
+                if type(value) is str and not low <= len(value) <= high:
+                    return [ValidationIssue((), f"string length {len(value)} outside [{low}, {high}]")]
+                return None
+
+            checks.append(check_length)
+
+        if "pattern" in schema:
+            search = re.compile(schema["pattern"]).search
+            pattern = schema["pattern"]
+
+            def check_pattern(value):
+                if type(value) is str and search(value) is None:
+                    return [ValidationIssue((), f"string does not match pattern {pattern!r}")]
+                return None
+
+            checks.append(check_pattern)
+        return checks
+
+    @staticmethod
+    def _compile_object(schema: Dict[str, Any], fail_fast: bool, refs: "_References") -> Check:
+        """properties/required/additionalProperties en una sola pasada por el registro"""
+        properties = {
+            key: SchemaCompiler.compile(sub, fail_fast, refs)
+            for key, sub in schema.get("properties", {}).items()
+        }
+        required = tuple(schema.get("required", ()))
+        additional = schema.get("additionalProperties", True)
+        if additional is True:
+            additional_check = None
+        elif additional is False:
+            additional_check = False
+        else:
+            additional_check = SchemaCompiler.compile(additional, fail_fast, refs)
+
+        get_property = properties.get
+
+        def check_object(value):
+            if type(value) is not dict:
+                return None
+
+            errors = None
+            for key in required:
+                if key not in value:
+                    issue = ValidationIssue((), f"missing required property '{key}'")
+                    if fail_fast:
+                        return [issue]
+                    errors = [issue] if errors is None else errors + [issue]
+
+            for key, item in value.items():
+                check = get_property(key)
+                if check is None:
+                    if additional_check is None:
+                        continue
+                    if additional_check is False:
+                        issues = [ValidationIssue((), f"additional property '{key}' is not allowed")]
+                    else:
+                        issues = additional_check(item)
+                        if issues:
+                            issues = [ValidationIssue((key,) + i.path, i.message) for i in issues]
+                else:
+                    issues = check(item)
+                    if issues:
+                        issues = [ValidationIssue((key,) + i.path, i.message) for i in issues]
+
+                if issues:
+                    if fail_fast:
+                        return issues
+                    if errors is None:
+                        errors = issues
+                    else:
+                        errors.extend(issues)
+            return errors
+
+        return check_object
+
+    @staticmethod
+    def _compile_array(schema: Dict[str, Any], fail_fast: bool, refs: "_References") -> Check:
+        items = schema.get("items")
+        item_check = SchemaCompiler.compile(items, fail_fast, refs) if isinstance(items, (dict, bool)) else None
+        if item_check is SchemaCompiler._accept:
+            item_check = None
+        min_items = schema.get("minItems", 0)
+        max_items = schema.get("maxItems")
+
+        def check_array(value):
+            if type(value) is not list:
+                return None
+
+            errors = None
+            size = len(value)
+            if size < min_items or (max_items is not None and size > max_items):
+                errors = [ValidationIssue((), f"array length {size} outside [{min_items}, {max_items}]")]
+                if fail_fast:
+                    return errors
+
+            if item_check is not None:
+                for index, item in enumerate(value):
+                    issues = item_check(item)
+                    if issues:
+                        issues = [ValidationIssue((index,) + i.path, i.message) for i in issues]
+                        if fail_fast:
+                            return issues
+                        if errors is None:
+                            errors = issues
+                        else:
+                            errors.extend(issues)
+            return errors
+
+        return check_array
+
+    @staticmethod
+    def _compile_any_of(schemas: List[Any], refs: "_References") -> Check:
+        # Las ramas siempre se compilan en modo early-exit: solo importa si pasan
+        branches = tuple(SchemaCompiler.compile(sub, True, refs) for sub in schemas)
+
+        def check_any_of(value):
+            for branch in branches:
+                if not branch(value):
+                    return None
+            return [ValidationIssue((), "value does not match any schema in anyOf")]
+
+        return check_any_of
+
+    @staticmethod
+    def _compile_one_of(schemas: List[Any], refs: "_References") -> Check:
+        branches = tuple(SchemaCompiler.compile(sub, True, refs) for sub in schemas)
+
+        def check_one_of(value):
+            matches = 0
+            for branch in branches:
+                if not branch(value):
+                    matches += 1
+                    if matches > 1:
+                        return [ValidationIssue((), "value matches more than one schema in oneOf")]
+            if matches == 0:
+                return [ValidationIssue((), "value does not match any schema in oneOf")]
+            return None
+
+        return check_one_of
+
+    @staticmethod
+    def _compile_not(schema: Any, refs: "_References") -> Check:
+        branch = SchemaCompiler.compile(schema, True, refs)
+
+        def check_not(value):
+            if not branch(value):
+                return [ValidationIssue((), "value must not match the schema in 'not'")]
+            return None
+
+        return check_not
+
+
+class _References:
+    """
+    Resuelve y compila los $ref locales ("#", "#/definitions/x", "#/$defs/x")
+
+    Cada referencia se compila una vez por modo; las recursivas pasan por
+    una indirección que se completa al terminar de compilar el destino.
+    """
+
+    def __init__(self, root: Any):
+        self.root = root
+        self._compiled: Dict[Tuple[str, bool], Check] = {}
+
+    def compile(self, ref: Any, fail_fast: bool) -> Check:
+        key = (ref, fail_fast)
+        check = self._compiled.get(key)
+        if check is None:
+            target = self.resolve(ref)
+            compiled: List[Check] = []
+            self._compiled[key] = lambda value: compiled[0](value)
+            compiled.append(SchemaCompiler.compile(target, fail_fast, self))
+            check = self._compiled[key] = compiled[0]
+        return check
+
+    def resolve(self, ref: Any) -> Any:
+        if not isinstance(ref, str) or not ref.startswith("#"):
+            raise ValueError(f"Unsupported $ref {ref!r} (only local references are supported)")
+        node = self.root
+        pointer = unquote(ref[1:])
+        if pointer:
+            if not pointer.startswith("/"):
+                raise ValueError(f"Unsupported $ref {ref!r} (only JSON Pointers are supported)")
+            for part in pointer[1:].split("/"):
+                part = part.replace("~1", "/").replace("~0", "~")
+                try:
+                    node = node[int(part)] if isinstance(node, list) else node[part]
+                except (KeyError, IndexError, ValueError, TypeError):
+                    raise ValueError(f"Unresolvable $ref {ref!r}") from None
+        return node
+
+
+def _enum_key(value: Any) -> tuple:
+    """Clave hashable con la igualdad JSON de un valor escalar"""
+    value_type = type(value)
+    if value_type is int or value_type is float:
+        return (float, value)
+    return (value_type, value)
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """Igualdad JSON: los números se comparan por valor y los booleanos aparte"""
+    if type(a) is dict and type(b) is dict:
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if type(a) is list and type(b) is list:
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    if type(a) in (dict, list) or type(b) in (dict, list):
+        return False
+    return _enum_key(a) == _enum_key(b)
+
+
+def _json_type(value: Any) -> str:
+    """Nombre JSON del tipo de un valor Python"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
+
+
+class SchemaValidator:
+    """
+    Validador de registros basado en un JSON Schema compilado
+
+    Ejemplo:
+        validator = SchemaValidator.from_file("schema.json")
+        report = validator.validate_file("data.jsonl", workers=4)
+    """
+
+    def __init__(self, schema: Dict[str, Any], fail_fast: bool = False):
+        self.schema = schema
+        self.fail_fast = fail_fast
+        self._check = SchemaCompiler.compile(schema, fail_fast)
+
+    @classmethod
+    def from_file(cls, filepath: str, fail_fast: bool = False) -> "SchemaValidator":
+        """Carga y compila un schema desde un archivo JSON"""
+        with open_input(filepath) as f:
+            return cls(json.load(f), fail_fast)
+
+    @classmethod
+    def from_structure(
+            cls, structure: DocumentStructure, fail_fast: bool = False
+    ) -> "SchemaValidator":
+        """Compila el schema que SchemaTransformer genera para una estructura"""
+        return cls(SchemaTransformer.to_json_schema(structure), fail_fast)
+
+    def validate(self, record: Any) -> List[ValidationIssue]:
+        """Valida un registro y retorna la lista de errores (vacía si es válido)"""
+        return self._check(record) or []
+
+    def is_valid(self, record: Any) -> bool:
+        return not self._check(record)
+
+    def iter_invalid(self, records: Iterable[Any]) -> Iterator[RecordResult]:
+        """Valida registros en streaming y produce solo los inválidos"""
+        check = self._check
+        for index, record in enumerate(records):
+            issues = check(record)
+            if issues:
+                yield RecordResult(index, issues)
+
+    def validate_file(
+            self,
+            filepath: str,
+            workers: int = 1,
+            chunk_size: int = 1000,
+            max_errors: Optional[int] = None,
+            max_results: Optional[int] = 100,
+    ) -> ValidationReport:
+        """
+        Valida un archivo JSON, YAML, TOON o JSON Lines ("-" lee stdin)
+
+        Los archivos JSON Lines se leen línea a línea y, con workers > 1,
+        el decodificado y la validación de cada bloque de líneas se reparten
+        entre procesos. En los demás formatos cada documento es un registro
+        (YAML y TOON multi-documento se leen en streaming).
+        En modo fail_fast la validación se detiene en el primer registro inválido.
+
+        El reporte guarda como mucho `max_results` resultados inválidos (None
+        para todos); `report.invalid` los cuenta siempre todos.
+        """
+        report = ValidationReport()
+        start = time.perf_counter()
+
+        fmt = detect_format(filepath)
+        if fmt == "jsonl":
+            report.location = "line"
+            with open_input(filepath, binary=True) as f:
+                chunks = _line_blocks(f, chunk_size)
+                batches = ordered_map(
+                    _validate_lines, chunks, workers,
+                    initializer=_init_worker, initargs=(self.schema, self.fail_fast),
+                )
+                for count, results, positions in batches:
+                    stopped_at = self._collect(report, results, max_errors, max_results)
+                    if stopped_at is not None:
+                        # Solo cuentan los registros hasta el que detuvo la validación
+                        report.records += positions[stopped_at]
+                        batches.close()
+                        break
+                    report.records += count
+        else:
+            with open_input(filepath) as f:
+                for index, record in enumerate(_iter_documents(f, fmt), 1):
+                    report.records += 1
+                    issues = self._check(record)
+                    if not issues:
+                        continue
+                    if self._collect(report, [RecordResult(index, issues)], max_errors, max_results) is not None:
+                        break
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _collect(
+            self,
+            report: ValidationReport,
+            results: List[RecordResult],
+            max_errors: Optional[int],
+            max_results: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Acumula resultados; si la validación debe detenerse retorna la
+        posición en `results` del resultado que la detuvo
+        """
+        for position, result in enumerate(results):
+            report.invalid += 1
+            if max_results is None or len(report.results) < max_results:
+                report.results.append(result)
+            if self.fail_fast or (max_errors is not None and report.invalid >= max_errors):
+                report.stopped_early = True
+                return position
+        return None
+
+
+def _iter_documents(f, fmt: Optional[str]) -> Iterator[Any]:
+    """Documentos de un archivo JSON, YAML o TOON abierto en modo texto"""
+    if fmt == "yaml":
+        from ..parsers.yaml_parser import YAMLParser
+        return YAMLParser.iter_documents(f)
+    if fmt == "toon":
+        from ..parsers.toon_parser import TOONParser
+        return TOONParser.iter_documents(f)
+    return iter([json.load(f)])
+
+
+# Estado por proceso: cada worker compila el schema una sola vez
+_worker_check: Optional[Check] = None
+
+
+def _init_worker(schema: Dict[str, Any], fail_fast: bool) -> None:
+    global _worker_check
+    _worker_check = SchemaCompiler.compile(schema, fail_fast)
+
+
+def _line_blocks(f, chunk_size: int) -> Iterator[Tuple[int, bytes]]:
+    """
+    Agrupa líneas en bloques de bytes (número de primera línea, contenido)
+
+    Enviar un único bloque de bytes a cada worker es mucho más barato de
+    serializar que una lista de líneas individuales.
+    """
+    first_line = 1
+    for lines in chunked(f, chunk_size):
+        if first_line == 1 and lines[0].startswith(b'\xef\xbb\xbf'):
+            lines[0] = lines[0][3:]
+        yield first_line, b"".join(lines)
+        first_line += len(lines)
+
+
+def _validate_lines(block: Tuple[int, bytes]) -> Tuple[int, List[RecordResult], List[int]]:
+    """
+    Decodifica y valida un bloque de líneas JSON Lines
+
+    Retorna (registros del bloque, resultados inválidos, número de registros
+    del bloque hasta cada resultado inclusive).
+    """
+    check = _worker_check
+    loads = json.loads
+    first_line, content = block
+    results = []
+    positions = []
+    count = 0
+    for line_no, line in enumerate(content.splitlines(), first_line):
+        if not line.strip():
+            continue
+        count += 1
+        try:
+            record = loads(line)
+        except ValueError as e:
+            results.append(RecordResult(line_no, [ValidationIssue((), f"invalid JSON: {e}")]))
+            positions.append(count)
+            continue
+        issues = check(record)
+        if issues:
+            results.append(RecordResult(line_no, issues))
+            positions.append(count)
+    return count, results, positions
@@ -0,0 +1,202 @@
+import json
+
+import pytest
+
+from src.validators.schema_validator import SchemaValidator
+
+
+def errors(schema, value, fail_fast=False):
+    return SchemaValidator(schema, fail_fast=fail_fast).validate(value)
+
+
+def is_valid(schema, value):
+    return SchemaValidator(schema).is_valid(value)
+
+
+# Keywords soportados: un caso válido y uno inválido por keyword
+
+@pytest.mark.parametrize("schema, valid, invalid", [
+    ({"type": "string"}, "a", 1),
+    ({"type": "integer"}, 2, "2"),
+    ({"type": "integer"}, 2.0, 2.5),
+    ({"type": "integer"}, -3, True),
+    ({"type": "number"}, 1.5, None),
+    ({"type": "boolean"}, False, 0),
+    ({"type": "null"}, None, 0),
+    ({"type": "array"}, [], {}),
+    ({"type": "object"}, {}, []),
+    ({"type": ["string", "null"]}, None, 1),
+    ({"enum": ["a", 1]}, "a", "b"),
+    ({"enum": [1]}, 1.0, True),
+    ({"enum": [[1, {"a": 2}]]}, [1.0, {"a": 2}], [True, {"a": 2}]),
+    ({"const": 2}, 2.0, 3),
+    ({"minimum": 1}, 1, 0),
+    ({"maximum": 1}, 1, 2),
+    ({"exclusiveMinimum": 1}, 2, 1),
+    ({"exclusiveMaximum": 1}, 0.5, 1),
+    ({"minLength": 2}, "ab", "a"),
+    ({"maxLength": 2}, "ab", "abc"),
+    ({"pattern": "^a+$"}, "aa", "ab"),
+    ({"properties": {"a": {"type": "integer"}}}, {"a": 1, "b": "x"}, {"a": "x"}),
+    ({"required": ["a"]}, {"a": None}, {"b": 1}),
+    ({"additionalProperties": False, "properties": {"a": {}}}, {"a": 1}, {"a": 1, "b": 2}),
+    ({"additionalProperties": {"type": "string"}}, {"b": "x"}, {"b": 1}),
+    ({"items": {"type": "integer"}}, [1, 2], [1, "x"]),
+    ({"minItems": 1}, [1], []),
+    ({"maxItems": 1}, [1], [1, 2]),
+    ({"allOf": [{"type": "integer"}, {"minimum": 0}]}, 1, -1),
+    ({"anyOf": [{"type": "integer"}, {"type": "string"}]}, "x", None),
+    ({"oneOf": [{"type": "integer"}, {"minimum": 0}]}, -1, 1),
+    ({"not": {"type": "string"}}, 1, "x"),
+    ({"$ref": "#/definitions/n", "definitions": {"n": {"type": "integer"}}}, 1, "x"),
+    ({"$ref": "#/$defs/n", "$defs": {"n": {"type": "integer"}}}, 1, "x"),
+    (True, {"any": "thing"}, None),
+])
+def test_supported_keywords(schema, valid, invalid):
+    assert is_valid(schema, valid)
+    if schema is not True:
+        assert not is_valid(schema, invalid)
+
+
+def test_false_schema_rejects_everything():
+    assert not is_valid(False, None)
+
+
+def test_type_keyword_ignores_other_types():
+    # Los rangos, longitudes y propiedades solo se aplican a su tipo
+    assert is_valid({"minimum": 5, "minLength": 5, "required": ["a"], "minItems": 5}, True)
+
+
+def test_issue_paths():
+    schema = {"properties": {"users": {"items": {"properties": {"age": {"type": "integer"}}}}}}
+    (issue,) = errors(schema, {"users": [{"age": 1}, {"age": "x"}]})
+    assert issue.path == ("users", 1, "age")
+    assert issue.format_path() == "$.users[1].age"
+
+
+def test_ref_resolves_against_root():
+    schema = {
+        "properties": {"a": {"$ref": "#/definitions/x"}},
+        "definitions": {"x": {"type": "integer"}},
+    }
+    assert is_valid(schema, {"a": 1})
+    assert not is_valid(schema, {"a": "str"})
+
+
+def test_recursive_ref():
+    schema = {
+        "$defs": {
+            "node": {
+                "type": "object",
+                "properties": {
+                    "value": {"type": "integer"},
+                    "children": {"type": "array", "items": {"$ref": "#/$defs/node"}},
+                },
+            }
+        },
+        "$ref": "#/$defs/node",
+    }
+    assert is_valid(schema, {"value": 1, "children": [{"value": 2, "children": []}]})
+    (issue,) = errors(schema, {"value": 1, "children": [{"value": 2, "children": [{"value": "x"}]}]})
+    assert issue.path == ("children", 0, "children", 0, "value")
+
+
+def test_ref_to_root():
+    schema = {"properties": {"next": {"$ref": "#"}}, "required": ["id"]}
+    assert is_valid(schema, {"id": 1, "next": {"id": 2}})
+    assert not is_valid(schema, {"id": 1, "next": {}})
+
+
+def test_one_of_reports_multiple_matches():
+    (issue,) = errors({"oneOf": [{"type": "integer"}, {"minimum": 0}]}, 1)
+    assert "more than one" in issue.message
+
+
+def test_annotations_are_ignored():
+    assert is_valid({"title": "t", "description": "d", "format": "email", "default": 1, "examples": []}, 1)
+
+
+@pytest.mark.parametrize("schema", [
+    {"if": {"type": "string"}, "then": {"minLength": 1}},
+    {"patternProperties": {"^a": {"type": "integer"}}},
+    {"dependencies": {"a": ["b"]}},
+    {"propertyNames": {"pattern": "^a"}},
+    {"uniqueItems": True},
+    {"contains": {"type": "integer"}},
+    {"multipleOf": 2},
+    {"minProperties": 1},
+    {"items": [{"type": "integer"}]},
+    {"properties": {"a": {"not": {"patternProperties": {}}}}},
+])
+def test_unsupported_keywords_are_rejected(schema):
+    with pytest.raises(ValueError, match="Unsupported"):
+        SchemaValidator(schema)
+
+
+@pytest.mark.parametrize("ref", ["other.json#/x", "http://example.com/s.json", "#x"])
+def test_non_local_refs_are_rejected(ref):
+    with pytest.raises(ValueError, match="Unsupported"):
+        SchemaValidator({"$ref": ref})
+
+
+def test_unresolvable_ref():
+    with pytest.raises(ValueError, match="Unresolvable"):
+        SchemaValidator({"$ref": "#/definitions/missing"})
+
+
+def test_fail_fast_stops_at_first_issue():
+    schema = {"properties": {"a": {"type": "integer"}, "b": {"type": "integer"}}}
+    assert len(errors(schema, {"a": "x", "b": "y"})) == 2
+    assert len(errors(schema, {"a": "x", "b": "y"}, fail_fast=True)) == 1
+
+
+# validate_file: recuento de registros al detenerse antes de tiempo
+
+SCHEMA = {"properties": {"a": {"type": "integer"}}}
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    # Registros inválidos en las líneas 2 y 4 (la 3 está vacía)
+    path = tmp_path / "data.jsonl"
+    path.write_text('{"a": 1}\n{"a": "x"}\n\n{"a": "y"}\n{"a": 2}\n', encoding="utf-8")
+    return str(path)
+
+
+def test_jsonl_collects_all(jsonl_file):
+    report = SchemaValidator(SCHEMA).validate_file(jsonl_file)
+    assert (report.records, report.invalid, report.stopped_early) == (4, 2, False)
+    assert report.location == "line"
+    assert [result.index for result in report.results] == [2, 4]
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 1000), (1, 1), (2, 1)])
+def test_jsonl_fail_fast_counts_up_to_stopping_record(jsonl_file, workers, chunk_size):
+    report = SchemaValidator(SCHEMA, fail_fast=True).validate_file(
+        jsonl_file, workers=workers, chunk_size=chunk_size
+    )
+    assert (report.records, report.invalid, report.valid, report.stopped_early) == (2, 1, 1, True)
+
+
+def test_jsonl_max_errors_counts_up_to_stopping_record(jsonl_file):
+    report = SchemaValidator(SCHEMA).validate_file(jsonl_file, max_errors=2)
+    assert (report.records, report.invalid, report.stopped_early) == (3, 2, True)
+
+
+def test_max_results_bounds_kept_results(tmp_path):
+    path = tmp_path / "many.jsonl"
+    path.write_text("".join(json.dumps({"a": "x"}) + "\n" for _ in range(50)), encoding="utf-8")
+    report = SchemaValidator(SCHEMA).validate_file(str(path), max_results=5)
+    assert (report.records, report.invalid, len(report.results)) == (50, 50, 5)
+
+
+def test_multi_document_yaml(tmp_path):
+    path = tmp_path / "data.yaml"
+    path.write_text("a: 1\n---\na: x\n---\na: 3\n---\na: y\n", encoding="utf-8")
+
+    report = SchemaValidator(SCHEMA).validate_file(str(path))
+    assert (report.records, report.invalid, report.location) == (4, 2, "document")
+    assert [result.index for result in report.results] == [2, 4]
+
+    report = SchemaValidator(SCHEMA, fail_fast=True).validate_file(str(path))
+    assert (report.records, report.invalid, report.stopped_early) == (2, 1, True)